@@ -1,4 +1,5 @@
 import pygame
+from utils.text_cache import text_cache
 
 class Button:
     """
@@ -58,6 +59,6 @@ class Button:
         text_color = (255, 255, 255) if highlighted else (0, 0, 0)
 
         pygame.draw.rect(screen, button_color, self.rect)
-        text_surface = self.font.render(self.text, True, text_color)
+        text_surface = text_cache.render(self.font, self.text, text_color)
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
\ No newline at end of file
@@ -4,6 +4,7 @@ from analysis.slider import Slider
 from analysis.table import DataTable
 from utils.observering import Observable
 from utils.uiux import UIElement
+from utils.text_cache import text_cache
 
 class RangeSlider(UIElement, Observable):
     """
@@ -13,6 +14,10 @@ class RangeSlider(UIElement, Observable):
     -------
     display(screen)
         Render the slider on the given screen.
+    render_state()
+        Return what a frame of the slider shows.
+    dirty_rect()
+        Return the screen area the slider draws on.
     handle_events(event, is_locked=False)
         Handle mouse events for interactions with the slider.
     update_position(dx, dy)
@@ -108,13 +113,34 @@ class RangeSlider(UIElement, Observable):
         pygame.draw.circle(screen, self.handle_color, (int(end_handle_x), self.y), self.radius)
 
         # Draw the semi-transparent text label
-        text = self.font.render('Interval Slider', True, WHITE)
-        text_surface = pygame.Surface((text.get_width(), text.get_height()), pygame.SRCALPHA)
-        text_surface.blit(text, (0, 0))
-        text_surface.set_alpha(100)
-        screen.blit(text_surface,
+        text = text_cache.render(self.font, 'Interval Slider', WHITE, alpha=100)
+        screen.blit(text,
                     (self.x + self.width - text.get_width(), self.y - self.radius * 2 - text.get_height()))
 
+    def render_state(self):
+        """
+        Return what a frame of the slider shows, so unchanged frames need not be repainted.
+
+        Returns
+        -------
+        tuple
+            The position, range and handle values.
+        """
+        return self.x, self.y, self.min_value, self.max_value, self.start_value, self.end_value
+
+    def dirty_rect(self):
+        """
+        Return the screen area the slider draws on: the track, handles and the label above them.
+
+        Returns
+        -------
+        pygame.Rect
+            The bounding rectangle.
+        """
+        label_height = self.font.get_height()
+        return pygame.Rect(self.x - self.radius, self.y - self.radius * 2 - label_height,
+                           self.width + self.radius * 2, label_height + self.radius * 3 + 2)
+
     def handle_events(self, event, is_locked=False):
         """
         Handle mouse events for interactions with the slider.
@@ -1,6 +1,7 @@
 import pygame
 from utils.observering import Observable
 from utils.uiux import UIElement
+from utils.text_cache import text_cache
 class Slider(UIElement, Observable):
     """
     A class used to represent an interactive slider UI element.
@@ -9,6 +10,10 @@ class Slider(UIElement, Observable):
     -------
     display(screen)
         Displays the slider on the given Pygame screen.
+    render_state()
+        Returns what a frame of the slider shows.
+    dirty_rect()
+        Returns the screen area the slider draws on.
     handle_events(event, is_locked=False)
         Handles Pygame events like mouse clicks and movements.
     update_position(dx, dy)
@@ -100,13 +105,34 @@ class Slider(UIElement, Observable):
         screen.blit(circle_surface, (int(handle_x) - self.radius, self.y - self.radius))
 
         # Draw the semi-transparent text
-        text = self.font.render('Time Slider', True, WHITE)
-        text_surface = pygame.Surface((text.get_width(), text.get_height()), pygame.SRCALPHA)
-        text_surface.blit(text, (0, 0))
-        text_surface.set_alpha(100)
-        screen.blit(text_surface, (self.x + self.width - text.get_width(),
+        text = text_cache.render(self.font, 'Time Slider', WHITE, alpha=100)
+        screen.blit(text, (self.x + self.width - text.get_width(),
                                    self.y - self.radius * 2 - text.get_height()))
 
+    def render_state(self):
+        """
+        Returns what a frame of the slider shows, so unchanged frames need not be repainted.
+
+        Returns
+        -------
+        tuple
+            The position, range and value.
+        """
+        return self.x, self.y, self.min_value, self.max_value, self.current_value
+
+    def dirty_rect(self):
+        """
+        Returns the screen area the slider draws on: the track, handles and the label above them.
+
+        Returns
+        -------
+        pygame.Rect
+            The bounding rectangle.
+        """
+        label_height = self.font.get_height()
+        return pygame.Rect(self.x - self.radius, self.y - self.radius * 2 - label_height,
+                           self.width + self.radius * 2, label_height + self.radius * 3 + 2)
+
     def handle_events(self, event, is_locked=False):
         """
         Handle mouse events for the slider, such as dragging the handle or the entire slider.
@@ -1,13 +1,43 @@
+import numpy as np
 import pandas as pd
 import pygame
 from utils.observering import Observable, Observer
 from core.graph import Graph
 from analysis.slider import Slider
 from utils.uiux import UIElement
+from utils.text_cache import text_cache
 from analysis.helper_button import Button
 # Colors
 WHITE = (255, 255, 255)
 
+# Cell gradient: red (low values) to white (average values) to green (high values).
+GRADIENT_LOW, GRADIENT_AVG, GRADIENT_HIGH = (255, 0, 0), (255, 255, 255), (0, 255, 0)
+MISSING_COLOR = (100, 100, 100)  # Cells without a number
+
+
+def gradient_lut(low_color=GRADIENT_LOW, avg_color=GRADIENT_AVG, high_color=GRADIENT_HIGH):
+    """
+    Build the 256-entry color lookup table of the cell gradient.
+
+    Entries 0 to 127 go from the low color to the average color, entries 128 to 255 from the
+    average color to the high color.
+
+    Parameters:
+    - low_color (tuple): The RGB color of the lowest value.
+    - avg_color (tuple): The RGB color of the average value.
+    - high_color (tuple): The RGB color of the highest value.
+
+    Returns:
+    - numpy.ndarray: A (256, 3) uint8 array of RGB colors.
+    """
+    weight = np.linspace(0, 1, 128)[:, None]
+    low_half = np.array(low_color) * (1 - weight) + np.array(avg_color) * weight
+    high_half = np.array(avg_color) * (1 - weight) + np.array(high_color) * weight
+    return np.concatenate([low_half, high_half]).astype(np.uint8)
+
+
+GRADIENT_LUT = gradient_lut()
+
 # Screen dimensions
 WIDTH, HEIGHT = 800, 600
 
@@ -83,8 +113,14 @@ class DataTable(UIElement, Observer):
             Pygame rectangle object representing the table's position and size.
         column_stats : dict
             Dictionary storing statistical data (max, average, min) for each column.
+        window_stats : dict
+            The same statistics over the shown values only, which the cell gradient is relative to.
         highlighted_row : int
             Index of the currently highlighted row, or -1 if no row is highlighted.
+        surface : pygame.Surface
+            The table drawn so far, kept between frames and brought up to date by refresh_surface.
+        drawn_cells : list[list[tuple]]
+            What each cell of the surface shows, so only changed cells are drawn again.
 
         Returns
         -------
@@ -120,67 +156,57 @@ class DataTable(UIElement, Observer):
         self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
 
         self.column_stats = {}
+        self.window_stats = {}  # (high, average, low) of the shown values, per column.
+        self.cell_backgrounds = {}  # Gradient color of each shown value, per column.
 
+        # The table is drawn onto a cached surface (see refresh_surface), wider than the table by
+        # surface_margin on each side for headers that overhang their column.
+        self.surface = None
+        self.surface_key = None
+        self.surface_margin = 10
+        self.drawn_cells = []  # What each cell of the surface shows, by row and column.
+        self.drawn_start = None  # The first row of the day the surface shows.
+        self.start_index = 0
+        self.values_changed = True  # Whether set_values ran since the surface was last brought up to date.
 
-        self.set_values(initial_index)
-
-        for graph in self.graphs:
-            high_val = graph.df[graph.column].max()
-            low_val = graph.df[graph.column].min()
-            avg_val = graph.df[graph.column].mean()
-
-            self.column_stats[graph.column] = (high_val, avg_val, low_val)
+        self.set_values(initial_index)  # Also fills column_stats
 
         self.highlighted_row = -1  # Initially no row is highlighted
 
-    def get_gradient_color(self, value, high_val, avg_val, low_val):
+    def gradient_colors(self, values, high_val, avg_val, low_val):
         """
-        Determine the color for a specific value based on a gradient.
+        Determine the gradient colors of a column's values, through the GRADIENT_LUT.
 
-        The gradient goes from red (low values) to white (average values)
-        to green (high values).
+        Values at or above the average take the upper half of the table, scaled between the average
+        and the high value; values below it take the lower half, scaled between the low value and
+        the average. When every value is the same, they are all shown as average.
 
         Parameters:
-        - value (float): The specific value for which the color is being determined.
+        - values (numpy.ndarray): The values to color.
         - high_val (float): The high threshold value.
         - avg_val (float): The average value.
         - low_val (float): The low threshold value.
 
         Returns:
-        - pygame.Color: The interpolated color based on the given value's position within the gradient.
+        - numpy.ndarray: A (len(values), 3) uint8 array of RGB colors; missing values get MISSING_COLOR.
         """
-        high_color = pygame.Color('green')
-        avg_color = pygame.Color('white')
-        low_color = pygame.Color('red')
-
-        # Determine which segment of the gradient we're in and interpolate
-        if value >= avg_val:
-            weight = (value - avg_val) / (high_val - avg_val)
-            color = self.interpolate_color(avg_color, high_color, weight)
-        else:
-            weight = (value - low_val) / (avg_val - low_val)
-            color = self.interpolate_color(low_color, avg_color, weight)
-
-        return color
-
-    def interpolate_color(self, color1, color2, weight):
-        """
-        Linearly interpolate between two RGB colors based on a given weight.
-
-        Parameters:
-        - color1 (pygame.Color): The first color.
-        - color2 (pygame.Color): The second color.
-        - weight (float): The weight for interpolation, ranging from 0 to 1.
-
-        Returns:
-        - pygame.Color: The interpolated color.
-        """
-        # Linearly interpolate between the two RGB values
-        r = color1.r * (1 - weight) + color2.r * weight
-        g = color1.g * (1 - weight) + color2.g * weight
-        b = color1.b * (1 - weight) + color2.b * weight
-
-        return pygame.Color(int(r), int(g), int(b))
+        colors = np.empty((len(values), 3), dtype=np.uint8)
+        colors[:] = MISSING_COLOR
+        valid = np.isfinite(values)
+        if not valid.any():
+            return colors
+
+        if high_val == low_val:  # All values are equal, and so the average
+            colors[valid] = GRADIENT_LUT[128]
+            return colors
+
+        above = valid & (values >= avg_val)
+        below = valid & (values < avg_val)
+        indices = np.empty(len(values), dtype=np.intp)
+        indices[above] = 128 + np.rint((values[above] - avg_val) / (high_val - avg_val) * 127)
+        indices[below] = np.rint((values[below] - low_val) / (avg_val - low_val) * 127)
+        colors[valid] = GRADIENT_LUT[np.clip(indices[valid], 0, 255)]
+        return colors
 
     def set_values(self, index):
         """
@@ -201,30 +227,39 @@ class DataTable(UIElement, Observer):
         start_index = index - self.visible_rows // 2
         end_index = start_index + self.visible_rows
 
+        # Assuming all graphs share the same DateTime column; only the visible rows' labels are formatted.
+        day_meta = self.graphs[0].day.meta
+
         # Adjust start and end indices
-        if end_index > len(self.graphs[0].df):  # Assuming all graphs have the same length
-            end_index = len(self.graphs[0].df)
+        if end_index > day_meta.row_count:  # Assuming all graphs have the same length
+            end_index = day_meta.row_count
             start_index = end_index - self.visible_rows
         if start_index < 0:
             start_index = 0
             end_index = self.visible_rows
 
-        graph_df = pd.read_csv(self.graphs[0].df_path)  # Assuming all graphs share the same DateTime column
-        dates_times = graph_df["DateTime"].str.split(' ').tolist()[start_index:end_index]
-
-        self.current_values["DateTime"] = [dt[1] for dt in dates_times]  # Extracting the time part
+        self.current_values["DateTime"] = day_meta.time_labels(start_index, end_index)  # Extracting the time part
 
 
         self.column_widths = []  # List to store widths of each column
 
+        # Statistics come from each day's range index (DayData.value_stats), which answers any row
+        # range in constant time, so neither the whole day nor the window is scanned per slider tick.
+        self.window_stats.clear()
+        self.cell_backgrounds.clear()
         for graph in self.graphs:
-            high_val = graph.df[graph.column].max()
-            low_val = graph.df[graph.column].min()
-            avg_val = graph.df[graph.column].mean()
-
+            low_val, high_val, avg_val, _ = graph.day.value_stats(graph.column, 0, graph.day.meta.row_count)
             self.column_stats[graph.column] = (high_val, avg_val, low_val)
-            if graph.column not in self.current_values:
-                self.current_values[graph.column] = graph.df[graph.column].iloc[start_index:end_index].tolist()
+            if graph.column in self.current_values:
+                continue
+            self.current_values[graph.column] = graph.df[graph.column].iloc[start_index:end_index].tolist()
+
+            # The gradient of each column is relative to the shown values.
+            low_val, high_val, avg_val, _ = graph.day.value_stats(graph.column, start_index, end_index)
+            self.window_stats[graph.column] = (high_val, avg_val, low_val)
+            values = np.asarray(self.current_values[graph.column], dtype=np.float64)
+            self.cell_backgrounds[graph.column] = [tuple(color) for color in
+                                                   self.gradient_colors(values, high_val, avg_val, low_val).tolist()]
 
         for column in ["DateTime"] + [graph.column for graph in self.graphs]:  # Including the DateTime column
             if column in self.current_values:
@@ -235,15 +270,172 @@ class DataTable(UIElement, Observer):
         self.width = sum(self.column_widths) + len(self.column_widths) * self.column_spacing - self.column_spacing
         self.rect.width = self.width  # Adjust the width of the rectangle as well
 
+        self.start_index = start_index
+        self.values_changed = True
         self.highlighted_row = self.current_index - start_index
 
+    def column_colors(self):
+        """
+        Return the color of every column, the DateTime column first.
+
+        Returns:
+        - list[tuple]: An RGB tuple per column.
+        """
+        return [(0, 0, 0)] + [tuple(graph.color)[:3] for graph in self.graphs]
+
+    def column_offsets(self):
+        """
+        Return the x of every column's left border, relative to the table's left edge.
+
+        Returns:
+        - list[int]: One offset per column.
+        """
+        offsets = []
+        x_offset = 0
+        for width in self.column_widths:
+            offsets.append(x_offset)
+            x_offset += width + self.column_spacing
+        return offsets
+
+    def cell_states(self):
+        """
+        Return what every visible cell shows: its text, text color and background color.
+
+        Returns:
+        - list[list[tuple]]: Per row, a (text, text color, background color or None) tuple per column.
+        """
+        columns = list(self.current_values)
+        states = []
+        for row in range(self.visible_rows):
+            text_color = (255, 255, 255) if row == self.highlighted_row else (0, 0, 0)
+            states.append([(f"{self.current_values[column][row]}", text_color,
+                            self.cell_backgrounds[column][row] if column in self.cell_backgrounds else None)
+                           for column in columns])
+        return states
+
+    def build_surface(self):
+        """
+        Draw the parts of the table that only change with its columns (the headers and the grid lines)
+        onto a new cached surface, and mark every cell as not drawn yet.
+
+        Returns:
+        - None
+        """
+        margin = self.surface_margin
+        surface = pygame.Surface((self.width + 2 * margin + 1, self.height + 1), pygame.SRCALPHA)
+        colors = self.column_colors()
+        offsets = self.column_offsets()
+
+        for idx, column in enumerate(self.current_values):
+            text = text_cache.render(self.font, 'Time' if column == "DateTime" else column, colors[idx])
+            # Calculate centering for column header text
+            surface.blit(text, (margin + offsets[idx] + (self.column_widths[idx] - text.get_width()) / 2, 0))
+
+        border_width = 1
+        for row in range(self.visible_rows):
+            # Draw horizontal line at the bottom of each row
+            pygame.draw.line(surface, (0, 0, 0), (margin, (row + 1) * self.row_height),
+                             (margin + self.width, (row + 1) * self.row_height), border_width)
+
+        for idx, x_offset in enumerate(offsets):
+            # Column borders are drawn at half brightness, opaque as they were on the screen.
+            column_color = tuple(channel // 2 for channel in colors[idx])
+            for x in (margin + x_offset, margin + x_offset + self.column_widths[idx]):
+                pygame.draw.line(surface, column_color, (x, 0), (x, self.height - 1), border_width)
+
+        # Draw a border for the entire table
+        pygame.draw.rect(surface, (0, 0, 0), (margin, 0, self.width, self.height), 1)
+
+        self.surface = surface
+        self.drawn_cells = [[None] * len(offsets) for _ in range(self.visible_rows)]
+
+    def body_rect(self):
+        """
+        Return the area of the cached surface inside the table's outer border. Cells in the last
+        column and row are clipped to it, so they leave the border alone.
+
+        Returns:
+        - pygame.Rect: The area, in surface coordinates.
+        """
+        return pygame.Rect(self.surface_margin + 1, 1, self.width - 2, self.height - 2)
+
+    def draw_cell(self, row, idx, state):
+        """
+        Draw one cell onto the cached surface, inside its borders.
+
+        Parameters:
+        - row (int): The row of the cell, 0 being the first row below the headers.
+        - idx (int): The column of the cell.
+        - state (tuple): The (text, text color, background color or None) the cell shows.
+
+        Returns:
+        - None
+        """
+        text, text_color, background = state
+        cell_x = self.surface_margin + self.column_offsets()[idx]
+        cell_y = (row + 1) * self.row_height
+        cell_rect = pygame.Rect(cell_x + 1, cell_y + 1, self.column_widths[idx] - 1, self.row_height - 1)
+        self.surface.set_clip(cell_rect.clip(self.body_rect()))
+        self.surface.fill((0, 0, 0, 0))
+        if background is not None:
+            self.surface.fill(background + (150,))  # Semi-transparent gradient
+
+        text_surface = text_cache.render(self.font, text, text_color)
+        # Calculate the centered x and y positions:
+        self.surface.blit(text_surface, (cell_x + (self.column_widths[idx] - text_surface.get_width()) / 2,
+                                         cell_y + (self.row_height - text_surface.get_height()) / 2))
+        self.surface.set_clip(None)
+        self.drawn_cells[row][idx] = state
+
+    def refresh_surface(self):
+        """
+        Bring the cached table surface up to date with the current values.
+
+        The surface is rebuilt when the columns change (their names, widths or colors). When the
+        window only moved by a few rows, the drawn rows are scrolled along with it, so only the rows
+        that came into view, and the cells whose highlight or gradient color changed, are drawn.
+
+        Returns:
+        - None
+        """
+        key = (self.font, self.visible_rows, tuple(self.current_values), tuple(self.column_widths),
+               tuple(self.column_colors()))
+        if key == self.surface_key and not self.values_changed:
+            return
+        shift = self.start_index - self.drawn_start if self.drawn_start is not None else 0
+        if key != self.surface_key:
+            self.build_surface()
+            self.surface_key = key
+        elif 0 < abs(shift) < self.visible_rows:
+            # Move the cells of each column; the horizontal lines inside a column repeat every row, so
+            # they land on themselves, and the vertical borders stay where they are.
+            for x_offset, width in zip(self.column_offsets(), self.column_widths):
+                column_rect = pygame.Rect(self.surface_margin + x_offset + 1, self.row_height + 1,
+                                          width - 1, self.visible_rows * self.row_height - 1)
+                self.surface.set_clip(column_rect.clip(self.body_rect()))
+                self.surface.scroll(0, -shift * self.row_height)
+            self.surface.set_clip(None)
+            exposed = [[None] * len(self.column_widths) for _ in range(abs(shift))]
+            if shift > 0:
+                # The last row is a pixel shorter (the outer border), so the row it moved into is redrawn.
+                self.drawn_cells = self.drawn_cells[shift:] + exposed
+                self.drawn_cells[-1 - shift] = [None] * len(self.column_widths)
+            else:
+                self.drawn_cells = exposed + self.drawn_cells[:shift]
+        self.drawn_start = self.start_index
+
+        for row, states in enumerate(self.cell_states()):
+            for idx, state in enumerate(states):
+                if self.drawn_cells[row][idx] != state:
+                    self.draw_cell(row, idx, state)
+        self.values_changed = False
+
     def display(self, screen):
         """
         Display the data table on the given Pygame screen.
 
-        This method renders the table with its headers, data values, and appropriate colors.
-        The method uses various helper functions and attributes of the class to draw the table
-        with its columns and rows, color the cells based on their values, and highlight selected rows.
+        The table is drawn onto a cached surface (see refresh_surface), which is only brought up to
+        date when the shown values change, and blitted onto the screen.
 
         Parameters:
         - screen (pygame.Surface): The Pygame screen where the table should be rendered.
@@ -255,96 +447,29 @@ class DataTable(UIElement, Observer):
         - The method assumes that the DateTime column is always present.
         - Colors for columns are determined by their associated graph objects.
         """
-        def adjust_color(color, alpha=128):
-            """
-            Adjusts the color brightness and transparency.
+        if self.current_values:
+            self.refresh_surface()
+            screen.blit(self.surface, (self.x - self.surface_margin, self.y))
 
-            Parameters:
-            - color (tuple): An RGB tuple representing the color to adjust.
-            - alpha (int, optional): The desired transparency level (alpha channel). Default is 128.
+    def render_state(self):
+        """
+        Return what a frame of the table shows, so unchanged frames need not be repainted.
 
-            Returns:
-            - tuple: The adjusted color with reduced brightness and the given alpha value.
-            """
-            return (color[0] // 2, color[1] // 2, color[2] // 2, alpha)
+        Returns:
+        - tuple: The table's rectangle, highlighted row, column colors and statistics, and the shown values.
+        """
+        return (tuple(self.rect), self.highlighted_row, tuple(graph.color for graph in self.graphs),
+                tuple(self.column_stats.items()), tuple(tuple(values) for values in self.current_values.values()))
 
-        if self.current_values:
-            x_offset = self.x
-            for idx, column in enumerate(["DateTime"] + [graph.column for graph in self.graphs]):
-                color = pygame.Color("black") if column == "DateTime" else self.graphs[idx - 1].color
-                if column == "DateTime":
-                    column = 'Time'
-                text = self.font.render(column, True, color)
-
-                # Calculate centering for column header text
-                header_text_x = x_offset + (self.column_widths[idx] - text.get_width()) / 2
-                screen.blit(text, (header_text_x, self.y))
-                x_offset += self.column_widths[idx] + self.column_spacing
-
-            border_width = 1
-
-            # Inside the loop where you're displaying data row-wise:
-            for row in range(self.visible_rows):
-                x_offset = self.x
-
-                for idx, column in enumerate(self.current_values):
-                    value = self.current_values[column][row]
-
-                    # Determine text color
-                    text_color = pygame.Color("white") if row == self.highlighted_row else pygame.Color("black")
-                    original_color = pygame.Color("black") if column == "DateTime" else self.graphs[idx - 1].color
-                    column_color = adjust_color(original_color)
-
-                    # Draw the left border of each column
-                    pygame.draw.line(screen, column_color,
-                                     (x_offset, self.y + row * self.row_height),
-                                     (x_offset, self.y + (row + 1) * self.row_height), border_width)
-
-                    if column in self.column_stats:  # This checks if the column is not DateTime
-                        high_val = max(self.current_values[column])
-                        low_val = min(self.current_values[column])
-                        avg_val = sum(self.current_values[column]) / len(self.current_values[column])
-
-                        try:
-                            cell_bg_color = self.get_gradient_color(value, high_val, avg_val, low_val)
-                        except:
-                            cell_bg_color = (100, 100, 100)
-                        cell_rect = pygame.Rect(x_offset, self.y + (row + 1) * self.row_height, self.column_widths[idx],
-                                                self.row_height)
-
-                        # Create a temporary surface and fill it with the desired color and alpha transparency
-                        temp_surface = pygame.Surface((self.column_widths[idx], self.row_height), pygame.SRCALPHA)
-                        temp_surface.fill(
-                            (cell_bg_color[0], cell_bg_color[1], cell_bg_color[2], 150))  # 128 for semi-transparency
-
-                        # Blit the surface onto the main screen at the cell's location
-                        screen.blit(temp_surface, (x_offset, self.y + (row + 1) * self.row_height))
-
-                    text_surface = self.font.render(f"{value}", True, text_color)
-
-                    # Calculate the centered x and y positions:
-                    text_x = x_offset + (self.column_widths[idx] - text_surface.get_width()) / 2
-                    text_y = self.y + (row + 1) * self.row_height + (self.row_height - text_surface.get_height()) / 2
-
-                    screen.blit(text_surface, (text_x, text_y))
-
-                    # Increment the x_offset for the next column before drawing the right border
-                    x_offset += self.column_widths[idx]
-
-                    # Draw the right border for each column
-                    pygame.draw.line(screen, column_color,
-                                     (x_offset, self.y + row * self.row_height),
-                                     (x_offset, self.y + (row + 1) * self.row_height), border_width)
-
-                    x_offset += self.column_spacing
-
-                # Draw horizontal line at the bottom of each row
-                pygame.draw.line(screen, pygame.Color("black"),
-                                 (self.x, self.y + (row + 1) * self.row_height),
-                                 (self.x + self.width, self.y + (row + 1) * self.row_height), border_width)
-
-            # Draw a border for the entire table
-            pygame.draw.rect(screen, pygame.Color("black"), self.rect, 1)
+    def dirty_rect(self):
+        """
+        Return the screen area the table draws on. Cell text can overhang the estimated column widths
+        by a few pixels, so the table's rectangle is widened a little.
+
+        Returns:
+        - pygame.Rect: The bounding rectangle.
+        """
+        return self.rect.inflate(20, 4)
 
     def handle_events(self, event):
         """
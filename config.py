@@ -57,3 +57,7 @@ day_switch_position = (650, 10)
 range_slider_position = (50, 500)
 
 load_presets = False
+
+# Frame rate
+target_fps = 60  # Upper bound on frames per second while something is moving.
+idle_timeout_ms = 1000  # Longest wait for input when nothing is moving; the clock still ticks every second.
@@ -0,0 +1,199 @@
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+
+# The levels of the bar pyramid, finest first. Coarser levels are aggregated from finer ones.
+BAR_RULES = ('1T', '5T', '15T', '30T', '1H', '1D')
+BAR_LABELS = {'1T': '1m', '5T': '5m', '15T': '15m', '30T': '30m', '1H': '1h', '1D': '1d'}
+
+
+def rule_nanos(rule):
+    """
+    Return the length of a fixed-frequency resample rule in nanoseconds.
+
+    Args:
+        rule (str): A pandas rule such as '5T'.
+
+    Returns:
+        int: The bar length in nanoseconds.
+    """
+    return to_offset(rule).nanos
+
+
+class OhlcBuilder:
+    """
+    Builds OHLC bars from a column that arrives in consecutive, time-ordered chunks.
+
+    Bars are aligned to multiples of the rule since midnight, like pandas' resample, and a bar split
+    across two chunks is merged. Missing values are skipped and bars without any value are left out,
+    so the result matches resample(rule).agg(['first', 'max', 'min', 'last']).dropna().
+
+    Methods:
+        append(timestamps, values): Add the next chunk.
+        append_bars(bars): Add bars of the same or a finer rule.
+        result(): Return the bars built so far.
+    """
+
+    def __init__(self, rule='5T'):
+        """
+        Initialize an OhlcBuilder.
+
+        Args:
+            rule (str, optional): The pandas resample rule of the bars. Default is '5T'.
+        """
+        self.rule = rule
+        self._bar_ns = rule_nanos(rule)
+        self._chunks = []  # (bar starts, open, high, low, close) arrays per chunk
+        self.rows = 0
+
+    def append(self, timestamps, values):
+        """
+        Add the next chunk of rows.
+
+        Args:
+            timestamps (numpy.ndarray): int64 epoch nanoseconds, ascending and later than any previous chunk.
+            values (numpy.ndarray): The column values of those rows.
+        """
+        self.rows += len(timestamps)
+        values = np.asarray(values, dtype=np.float64)
+        valid = ~np.isnan(values)
+        timestamps, values = np.asarray(timestamps)[valid], values[valid]
+        if not len(values):
+            return
+
+        bars = timestamps - timestamps % self._bar_ns
+        starts = np.flatnonzero(np.r_[True, bars[1:] != bars[:-1]])
+        ends = np.r_[starts[1:], len(values)] - 1
+        self._add([bars[starts], values[starts], np.maximum.reduceat(values, starts),
+                   np.minimum.reduceat(values, starts), values[ends]])
+
+    def append_bars(self, bars):
+        """
+        Add bars built with the same rule or a finer one that divides it, e.g. 1-minute bars into 5-minute ones.
+
+        Args:
+            bars (pandas.DataFrame): Bars as returned by result(), later than anything added before.
+        """
+        if not len(bars):
+            return
+        times = bars.index.asi8
+        opens, highs, lows, closes = (bars[key].to_numpy(dtype=np.float64) for key in ('Open', 'High', 'Low', 'Close'))
+
+        starts_of = times - times % self._bar_ns
+        starts = np.flatnonzero(np.r_[True, starts_of[1:] != starts_of[:-1]])
+        ends = np.r_[starts[1:], len(times)] - 1
+        self._add([starts_of[starts], opens[starts], np.maximum.reduceat(highs, starts),
+                   np.minimum.reduceat(lows, starts), closes[ends]])
+
+    def _add(self, chunk):
+        """
+        Append (bar starts, open, high, low, close) arrays, merging a bar split across two chunks.
+        """
+        if self._chunks and self._chunks[-1][0][-1] == chunk[0][0]:
+            # The previous chunk ended inside this chunk's first bar.
+            last = self._chunks[-1]
+            last[2][-1] = max(last[2][-1], chunk[2][0])
+            last[3][-1] = min(last[3][-1], chunk[3][0])
+            last[4][-1] = chunk[4][0]
+            chunk = [array[1:] for array in chunk]
+        self._chunks.append(chunk)
+
+    def result(self):
+        """
+        Return the bars built so far.
+
+        Returns:
+            pandas.DataFrame: A frame indexed by bar start ('DateTime') with 'Open', 'High', 'Low' and 'Close'.
+        """
+        if self._chunks:
+            bars, opens, highs, lows, closes = (np.concatenate(arrays) for arrays in zip(*self._chunks))
+        else:
+            bars = np.empty(0, dtype=np.int64)
+            opens = highs = lows = closes = np.empty(0)
+        index = pd.DatetimeIndex(bars.view('datetime64[ns]'), name='DateTime', freq=None)
+        return pd.DataFrame({'Open': opens, 'High': highs, 'Low': lows, 'Close': closes}, index=index)
+
+
+def aggregate_bars(bars, rule):
+    """
+    Aggregate bars into coarser ones, e.g. 1-minute bars into 1-hour bars.
+
+    Args:
+        bars (pandas.DataFrame): Bars as returned by OhlcBuilder.result.
+        rule (str): The coarser pandas resample rule; a multiple of the bars' rule.
+
+    Returns:
+        pandas.DataFrame: The aggregated bars.
+    """
+    builder = OhlcBuilder(rule)
+    builder.append_bars(bars)
+    return builder.result()
+
+
+def pick_bar_rule(span_ns, max_bars):
+    """
+    Pick the finest pyramid level that shows a time span in at most max_bars bars.
+
+    Args:
+        span_ns (int): The displayed time span in nanoseconds.
+        max_bars (int): The most bars that fit the display.
+
+    Returns:
+        str: A rule from BAR_RULES; the coarsest one if none fits.
+    """
+    for rule in BAR_RULES:
+        if span_ns // rule_nanos(rule) + 1 <= max_bars:
+            return rule
+    return BAR_RULES[-1]
+
+
+def ohlc_slice(bars, timestamps, values, start, stop, rule='5T', edge_bars=None):
+    """
+    Return the OHLC bars of rows start..stop of a day, taken from the day's bars.
+
+    Bars fully inside the range are sliced out of the precomputed bars (found by binary search);
+    only the two edge bars, which the range may cut, are rebuilt, from the rows or from finer bars
+    given by edge_bars. The result equals resampling the rows of the range.
+
+    Args:
+        bars (pandas.DataFrame): The bars of the whole day, as returned by OhlcBuilder.result.
+        timestamps (numpy.ndarray): int64 epoch nanoseconds of every row of the day.
+        values (numpy.ndarray): The column values of every row of the day.
+        start (int): First row of the range.
+        stop (int): One past the last row of the range.
+        rule (str, optional): The pandas resample rule the bars were built with. Default is '5T'.
+        edge_bars (callable, optional): Called with (start, stop) rows of an edge, returns the finer bars of
+                                        those rows. Default is None (edges are built from the rows).
+
+    Returns:
+        pandas.DataFrame: The bars of the range.
+    """
+    builder = OhlcBuilder(rule)
+
+    def add_rows(first, last):
+        if edge_bars is not None:
+            builder.append_bars(edge_bars(first, last))
+        else:
+            builder.append(timestamps[first:last], values[first:last])
+
+    start, stop = max(start, 0), min(stop, len(timestamps))
+    if start >= stop:
+        return builder.result()
+
+    bar_ns = rule_nanos(rule)
+    first_bar = timestamps[start] - timestamps[start] % bar_ns
+    last_bar = timestamps[stop - 1] - timestamps[stop - 1] % bar_ns
+    if first_bar == last_bar:
+        add_rows(start, stop)
+        return builder.result()
+
+    head_stop = start + np.searchsorted(timestamps[start:stop], first_bar + bar_ns)
+    tail_start = start + np.searchsorted(timestamps[start:stop], last_bar)
+    bar_starts = bars.index.asi8
+    inner = slice(np.searchsorted(bar_starts, first_bar, 'right'), np.searchsorted(bar_starts, last_bar, 'left'))
+
+    add_rows(start, head_stop)
+    builder.append_bars(bars.iloc[inner])
+    add_rows(tail_start, stop)
+    return builder.result()
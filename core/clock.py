@@ -1,6 +1,6 @@
+import time
 import pygame
 from datetime import datetime
-from utils.pygame_helper_classes import Label
 from utils.uiux import UIElement
 class Clock(UIElement):
     """
@@ -9,11 +9,16 @@ class Clock(UIElement):
 
     Constants:
         COLOR_MAP (dict): A dictionary mapping color names to RGB values.
+        GLYPHS (str): The characters of the glyph atlas the time is composed from.
 
     Methods
     -------
     display(screen):
         Displays the current time on the Pygame screen.
+    render_state():
+        Returns what a frame of the clock shows.
+    dirty_rect():
+        Returns the screen area the clock draws on.
     update_position(dx, dy):
         Updates the position of the clock on the screen by the given deltas.
     resize(new_width, new_height):
@@ -37,6 +42,9 @@ class Clock(UIElement):
         "black": (0, 0, 0)
     }
 
+    # Every character '%I:%M:%S %p' produces in an English locale; others are rendered one by one.
+    GLYPHS = "0123456789: APM"
+
     def __init__(self, x=10, y=10, width=None, height=None, text_color="black", border_color="black",
                  bg_color="darkGray"):
         """
@@ -84,13 +92,18 @@ class Clock(UIElement):
 
         self.font = pygame.font.SysFont('Arial', 16)
 
+        self._atlas = None  # (surface, {char: area}) of every glyph in GLYPHS
+        self._face_cache = None  # (time text, face surface) of the last composed second
+        self._second = None
+        self._text = None
 
     def display(self, screen):
         """
         Renders the current time on the given Pygame screen.
 
         The time is displayed in the format '%I:%M:%S %p'. The method also handles the rendering of the clock's background
-        and border colors based on the instance's attributes.
+        and border colors based on the instance's attributes. The clock face is composed from the glyph atlas
+        once per second and blitted as is in between.
 
         Parameters
         ----------
@@ -98,41 +111,90 @@ class Clock(UIElement):
             The Pygame screen on which the clock is rendered.
 
         """
-        current_time = datetime.now().strftime('%I:%M:%S %p')
-
-        start_x_position = self.x
-        x_position = self.x
+        screen.blit(self._face(), (self.x - 5, self.y - 5))
 
-        labels = []
-        max_char_height = 0  # Track the maximum character height
+    def _glyph_atlas(self):
+        """
+        Returns the glyph atlas: one surface holding every character the clock can show, drawn on the
+        clock's background, and the area of each character in it. It is built on first use.
+        """
+        if self._atlas is None:
+            glyphs = [self.font.render(char, True, self.text_rgb) for char in self.GLYPHS]
+            atlas = pygame.Surface((sum(glyph.get_width() for glyph in glyphs),
+                                    max(glyph.get_height() for glyph in glyphs)))
+            atlas.fill(self.bg_rgb)
+            areas = {}
+            x_position = 0
+            for char, glyph in zip(self.GLYPHS, glyphs):
+                atlas.blit(glyph, (x_position, 0))
+                areas[char] = pygame.Rect(x_position, 0, glyph.get_width(), glyph.get_height())
+                x_position += glyph.get_width()
+            self._atlas = (atlas, areas)
+        return self._atlas
+
+    def _face(self):
+        """
+        Returns the clock face (background, time and border) for the current second, composed from
+        the glyph atlas only when the shown time changed.
+        """
+        current_time = self._time_text()
+        if self._face_cache is not None and self._face_cache[0] == current_time:
+            return self._face_cache[1]
 
+        atlas, areas = self._glyph_atlas()
+        chars = []  # (source surface, area in it) per character
         for char in current_time:
-            label = Label(self.font, char, self.text_rgb, (x_position, self.y), anchor="topleft")
-            if char == '9':
-                label.rect.y -= 2
-            x_position += label.rect.width
-            labels.append(label)
-
-            # Update the maximum character height
-            max_char_height = max(max_char_height, label.rect.height)
-
-        max_width = sum(label.rect.width for label in labels)
+            if char in areas:
+                chars.append((atlas, areas[char]))
+            else:
+                # Not in the atlas, e.g. a localized AM/PM marker: render it on its own.
+                glyph = self.font.render(char, True, self.text_rgb)
+                chars.append((glyph, glyph.get_rect()))
+        max_width = sum(area.width for _, area in chars)
+        max_char_height = max(area.height for _, area in chars)
+
+        face = pygame.Surface((max_width + 10, max_char_height + 10))
+        face.fill(self.bg_rgb)
+        x_position = 5
+        for source, area in chars:
+            face.blit(source, (x_position, 5), area)
+            x_position += area.width
+        pygame.draw.rect(face, self.border_rgb, face.get_rect(), 2)
+
+        self._face_cache = (current_time, face)
+        return face
+
+    def _time_text(self):
+        """
+        Returns the current time as the clock shows it, formatted once per second.
+        """
+        second = int(time.time())
+        if second != self._second:
+            self._second = second
+            self._text = datetime.now().strftime('%I:%M:%S %p')
+        return self._text
 
-        # Draw background rectangle
-        pygame.draw.rect(screen, self.bg_rgb, (start_x_position - 5, self.y - 5, max_width + 10, max_char_height + 10))
+    def render_state(self):
+        """
+        Returns what a frame of the clock shows, so it is only repainted when the second changes.
 
-        # Reset x_position and y_position for drawing the text (centered vertically)
-        x_position = start_x_position
-        y_position = self.y + (max_char_height - labels[0].rect.height) // 2
+        Returns
+        -------
+        tuple
+            The position and the time text.
+        """
+        return self.x, self.y, self._time_text()
 
-        # Draw the text
-        for label in labels:
-            label.rect.topleft = (x_position, y_position)
-            label.draw(screen)
-            x_position += label.rect.width
+    def dirty_rect(self):
+        """
+        Returns the screen area the clock draws on: the clock face.
 
-        # Draw the border rectangle
-        pygame.draw.rect(screen, self.border_rgb, (start_x_position - 5, self.y - 5, max_width + 10, max_char_height + 10), 2)
+        Returns
+        -------
+        pygame.Rect
+            The bounding rectangle.
+        """
+        return self.rect.union(self._face().get_rect(topleft=(self.x - 5, self.y - 5)))
 
     def update_position(self, dx, dy):
         """
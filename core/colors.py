@@ -0,0 +1,75 @@
+import numpy as np
+
+
+# Colour indices of the up/down colouring: index 0 is down (red), 1 is up (green).
+DOWN_COLOR = (255, 0, 0)
+UP_COLOR = (0, 255, 0)
+PROFIT_COLORS = (DOWN_COLOR, UP_COLOR)
+
+# Default number of points (or bars) the profit colouring compares with.
+DEFAULT_LOOKBACK = 5
+
+
+def rising_mask(values, lookback):
+    """
+    Return which points are higher than the point lookback places before them. The first lookback
+    points have nothing to compare with and count as not rising.
+
+    Args:
+        values (numpy.ndarray): The series.
+        lookback (int): How many points back to compare with.
+
+    Returns:
+        numpy.ndarray: A boolean mask, usable as colour indices into PROFIT_COLORS.
+    """
+    values = np.asarray(values)
+    rising = np.zeros(len(values), dtype=bool)
+    if lookback < len(values):
+        rising[lookback:] = values[lookback:] > values[:-lookback]
+    return rising
+
+
+def above_average_mask(values):
+    """
+    Return which points are at or above the running average before them. The average at point i is
+    the sum of the points before it divided by i + 1, as the graph's colouring has always computed
+    it. The first point counts as above.
+
+    Args:
+        values (numpy.ndarray): The series.
+
+    Returns:
+        numpy.ndarray: A boolean mask, usable as colour indices into PROFIT_COLORS.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    above = np.ones(len(values), dtype=bool)
+    if len(values) > 1:
+        running_average = np.cumsum(values)[:-1] / np.arange(2, len(values) + 1)
+        above[1:] = values[1:] >= running_average
+    return above
+
+
+def window_profit_mask(step_rising, lookback_rising, start, stop, lookback):
+    """
+    Return the profit colouring of the window start..stop of a series, from masks of the whole series.
+
+    Within the window, a point is green when it rose over the lookback; the first lookback points
+    of the window, which have no such point inside it, compare with the point before them, and
+    the window's first point counts as rising.
+
+    Args:
+        step_rising (numpy.ndarray): rising_mask(values, 1) of the whole series.
+        lookback_rising (numpy.ndarray): rising_mask(values, lookback) of the whole series.
+        start (int): First point of the window.
+        stop (int): One past the last point of the window.
+        lookback (int): The lookback the masks were built with.
+
+    Returns:
+        numpy.ndarray: A boolean mask of stop - start points, True for green (up) and False for red (down).
+    """
+    count = stop - start
+    head = min(lookback, count)
+    rising = np.ones(count, dtype=bool)
+    rising[1:head] = step_rising[start + 1:start + head]
+    rising[head:] = lookback_rising[start + head:stop]
+    return rising
@@ -0,0 +1,270 @@
+import bisect
+import os
+
+import numpy as np
+
+from data.archive import DAY_FILE_PATTERN, open_archive
+from data.ingest import cache_dir_for, read_manifest
+
+
+class DayEntry:
+    """
+    One available day of a strategy.
+
+    Attributes:
+        number (int): The day number, N in DayN.csv.
+        path (str): Path of the day CSV (for archived days the CSV need not exist).
+        date (datetime.date or None): The session date, None for an empty day or one not converted yet.
+        row_count (int or None): The number of rows in the day, None until the day was converted.
+        size (int): The size of the day's data in bytes.
+        stamp (tuple): (mtime_ns, size) of the CSV the entry was built from, used for refreshing.
+    """
+
+    def __init__(self, number, path, date, row_count, size, stamp=None):
+        """
+        Initialize a DayEntry.
+
+        Args:
+            number (int): The day number.
+            path (str): Path of the day CSV.
+            date (datetime.date or None): The session date.
+            row_count (int or None): The number of rows in the day, None if not known yet.
+            size (int): The size of the day's data in bytes.
+            stamp (tuple, optional): (mtime_ns, size) of the source CSV. Default is None.
+        """
+        self.number = number
+        self.path = path
+        self.date = date
+        self.row_count = row_count
+        self.size = size
+        self.stamp = stamp
+
+
+def _session_date(timestamps):
+    """
+    Return the date of the first epoch-nanosecond timestamp, or None if there are none.
+    """
+    if not len(timestamps):
+        return None
+    return np.datetime64(int(timestamps[0]), 'ns').astype('datetime64[D]').item()
+
+
+class DayManifest:
+    """
+    A sorted index of the days available for a strategy, so navigation never probes the file system.
+
+    The manifest is built from the DayN.csv file names and their os.stat alone, so listing a
+    directory never reads a day. The date and row count of each day come from its cache manifest
+    when the day was converted before, and stay unknown otherwise. The directory is listed again
+    only when its mtime (or the archive's) changes, i.e. when day files are added or removed; a
+    file edited in place is re-checked when its entry is asked for (see entry). If the strategy has
+    an archive (see data.archive), its days are listed from the archive, except those whose CSV was
+    edited since the archive was built; CSVs added since are listed as well.
+
+    Attributes:
+        strategy_path (str): The strategy directory, e.g. ./data/strategy_zero.
+        entries (list[DayEntry]): The available days, sorted by day number.
+        days (list[int]): The sorted day numbers.
+
+    Methods:
+        refresh(): Re-list the directory and the archive if either changed since the last scan.
+        next_day(current_day, direction): Return the neighbouring available day, wrapping around.
+        entry(day): Return the entry of a day number.
+    """
+
+    def __init__(self, strategy_path):
+        """
+        Initialize a DayManifest and scan the strategy directory.
+
+        Args:
+            strategy_path (str): The strategy directory, e.g. ./data/strategy_zero.
+        """
+        self.strategy_path = os.path.normpath(strategy_path)
+        self.entries = []
+        self.days = []
+        self._archive_entries = {}  # day number -> DayEntry of the archived days
+        self._archive_mtime = None
+        self._source_mtimes = None  # (directory mtime, archive mtime) of the last scan
+        self.refresh()
+
+    def refresh(self):
+        """
+        Re-list the strategy directory and its archive if either changed since the last scan.
+        Otherwise this costs a few stats.
+
+        Returns:
+            None
+        """
+        archive = open_archive(self.strategy_path)
+        try:
+            directory_mtime = os.stat(self.strategy_path).st_mtime_ns
+        except FileNotFoundError:
+            directory_mtime = None
+        source_mtimes = (directory_mtime, archive.mtime if archive is not None else None)
+        if source_mtimes == self._source_mtimes:
+            return
+        self._source_mtimes = source_mtimes
+
+        if archive is None:
+            self._archive_entries = {}
+            self._archive_mtime = None
+        elif archive.mtime != self._archive_mtime:
+            self._archive_entries = {entry.number: entry for entry in self._scan_archive(archive)}
+            self._archive_mtime = archive.mtime
+
+        try:
+            entries = self._scan_directory(archive)
+        except FileNotFoundError:
+            print(f"Warning: Strategy directory {self.strategy_path} not found.")
+            entries = []
+        # Archived days, unless their CSV was edited since the archive was built (listed above).
+        listed = {entry.number for entry in entries}
+        entries += [entry for number, entry in self._archive_entries.items() if number not in listed]
+
+        self.entries = sorted(entries, key=lambda entry: entry.number)
+        self.days = [entry.number for entry in self.entries]
+
+    def _scan_directory(self, archive=None):
+        """
+        List the DayN.csv files from their names and stats, keeping the entries of unchanged files.
+
+        Args:
+            archive (DayArchive, optional): The strategy's archive. Days it holds an up-to-date copy
+                                            of are left out. Default is None.
+
+        Returns:
+            list[DayEntry]: The entries of the directory.
+
+        Raises:
+            FileNotFoundError: If the strategy directory does not exist.
+        """
+        known = {entry.path: entry for entry in self.entries}
+        entries = []
+        for filename in os.listdir(self.strategy_path):
+            match = DAY_FILE_PATTERN.match(filename)
+            if not match:
+                continue
+            path = os.path.join(self.strategy_path, filename)
+            if archive is not None and archive.is_current(int(match.group(1)), path):
+                continue
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue  # Removed while scanning.
+            stamp = (stat.st_mtime_ns, stat.st_size)
+
+            entry = known.get(path)
+            if entry is None or entry.stamp != stamp:
+                entry = DayEntry(int(match.group(1)), path, None, None, stat.st_size, stamp)
+                self._details_from_cache(entry)
+            entries.append(entry)
+        return entries
+
+    @staticmethod
+    def _details_from_cache(entry):
+        """
+        Fill in the date and row count of an entry from its day's cache, if the cache is up to date.
+
+        Args:
+            entry (DayEntry): The entry to complete.
+        """
+        manifest = read_manifest(entry.path)
+        if manifest is None or manifest['rows'] is None:
+            return
+        try:
+            # Only the first timestamp is touched, so mapping the file costs next to nothing.
+            timestamps = np.load(os.path.join(cache_dir_for(entry.path), 'DateTime.npy'),
+                                 mmap_mode='r' if manifest['rows'] else None)
+        except (OSError, ValueError):
+            return
+        entry.date = _session_date(timestamps)
+        entry.row_count = len(timestamps)
+
+    def _scan_archive(self, archive):
+        """
+        List the days held by a strategy archive.
+
+        Args:
+            archive (DayArchive): The mapped archive.
+
+        Returns:
+            list[DayEntry]: The entries of the archive.
+        """
+        entries = []
+        for day in archive.days:
+            timestamps, columns = archive.day_columns(day)
+            size = timestamps.nbytes + sum(values.nbytes for values in columns.values())
+            path = os.path.join(self.strategy_path, f"Day{day}.csv")
+            entries.append(DayEntry(day, path, _session_date(timestamps), len(timestamps), size))
+        return entries
+
+    def next_day(self, current_day, direction):
+        """
+        Return the available day next to current_day in the given direction, wrapping around.
+
+        current_day itself does not need to be available.
+
+        Args:
+            current_day (int): The day number to move from.
+            direction (int): Negative to move back, positive to move forward.
+
+        Returns:
+            int or None: The new day number, or None if there are no days.
+        """
+        if not self.days:
+            return None
+        if direction > 0:
+            pos = bisect.bisect_right(self.days, current_day)
+        else:
+            pos = bisect.bisect_left(self.days, current_day) - 1
+        return self.days[pos % len(self.days)]
+
+    def entry(self, day):
+        """
+        Return the entry of a day number. If the day's CSV was edited since the entry was made, the
+        entry is made again first (editing a file in place does not change the directory's mtime).
+
+        Args:
+            day (int): The day number.
+
+        Returns:
+            DayEntry or None: The entry, or None if the day is not available.
+        """
+        pos = bisect.bisect_left(self.days, day)
+        if pos == len(self.days) or self.days[pos] != day:
+            return None
+
+        entry = self.entries[pos]
+        if entry.stamp is not None:  # Archived entries have no CSV to compare with.
+            try:
+                stat = os.stat(entry.path)
+            except FileNotFoundError:
+                return entry
+            if (stat.st_mtime_ns, stat.st_size) != entry.stamp:
+                entry = DayEntry(entry.number, entry.path, None, None, stat.st_size,
+                                 (stat.st_mtime_ns, stat.st_size))
+                self._details_from_cache(entry)
+                self.entries[pos] = entry
+        return entry
+
+
+_manifests = {}  # strategy path -> DayManifest
+
+
+def get_manifest(strategy_path):
+    """
+    Return the up-to-date DayManifest of a strategy directory, building it on first use.
+
+    Args:
+        strategy_path (str): The strategy directory, e.g. ./data/strategy_zero.
+
+    Returns:
+        DayManifest: The manifest.
+    """
+    strategy_path = os.path.normpath(strategy_path)
+    manifest = _manifests.get(strategy_path)
+    if manifest is None:
+        manifest = _manifests[strategy_path] = DayManifest(strategy_path)
+    else:
+        manifest.refresh()
+    return manifest
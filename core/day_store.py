@@ -0,0 +1,638 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+from core.bars import BAR_RULES, OhlcBuilder, aggregate_bars, ohlc_slice
+from core.colors import above_average_mask, rising_mask
+from core.signals import SignalIndex
+from core.range_index import BlockRangeIndex
+from data.archive import DAY_FILE_PATTERN, open_archive
+from data.ingest import column_names, load_day
+
+
+class DayMeta:
+    """
+    Per-day metadata computed once when a day is loaded, for widgets that only need labels.
+
+    Time labels are not formatted up front: they are derived from the int64 timestamps for the
+    rows that are actually drawn, and cached by minute of the day.
+
+    Attributes:
+        session_date (str): The trading date of the day, formatted as '%m/%d/%Y'.
+        timestamps (numpy.ndarray): The int64 epoch nanoseconds of every row.
+        row_count (int): The number of rows in the day.
+
+    Methods:
+        time_label(row): Return the '%H:%M' time of a row.
+        time_labels(start, stop): Return the '%H:%M' times of a range of rows.
+    """
+
+    _labels = {}  # minute of the day -> '%H:%M', shared by every day
+
+    def __init__(self, index):
+        """
+        Initialize a DayMeta instance from a day's DateTime index.
+
+        Args:
+            index (pandas.DatetimeIndex): The 'DateTime' index of the day frame.
+        """
+        self.session_date = index[0].strftime('%m/%d/%Y') if len(index) else ''
+        self.timestamps = index.asi8
+        self.row_count = len(index)
+
+    def time_label(self, row):
+        """
+        Return the '%H:%M' time of a row.
+
+        Args:
+            row (int): The row number.
+
+        Returns:
+            str: The formatted time.
+        """
+        minute = int(self.timestamps[row] // 60_000_000_000 % 1440)
+        label = DayMeta._labels.get(minute)
+        if label is None:
+            label = DayMeta._labels[minute] = f"{minute // 60:02d}:{minute % 60:02d}"
+        return label
+
+    def time_labels(self, start, stop):
+        """
+        Return the '%H:%M' times of a range of rows.
+
+        Args:
+            start (int): First row of the range.
+            stop (int): One past the last row of the range.
+
+        Returns:
+            list[str]: The formatted times.
+        """
+        return [self.time_label(row) for row in range(max(start, 0), min(stop, self.row_count))]
+
+
+class DayData:
+    """
+    The parsed contents of a single day file, shared by every widget that displays it.
+
+    The frame is indexed by 'DateTime' and its column arrays are marked read-only, so the
+    same instance can safely be handed to any number of graphs and tables.
+
+    Attributes:
+        path (str): Path of the CSV file the data was read from.
+        mtime (float): Modification time of the file when it was read.
+        df (pandas.DataFrame): The parsed, read-only day frame.
+        meta (DayMeta): Session date, time labels and row count of the day.
+        refcount (int): Number of holders that acquired this day from the store.
+        prefetched (bool): True while the day was read ahead by the store and not acquired yet.
+
+    Methods:
+        ensure_columns(columns): Load columns the frame does not hold yet.
+        prepare(): Precompute what a graph needs when switching to this day.
+        ohlc(column, rule): Return the (cached) OHLC resample of a column.
+        ohlc_range(column, start, stop, rule): Return the OHLC bars of a range of rows.
+        value_range(column, start, stop): Return (min, max) of a column over a row range.
+        value_stats(column, start, stop): Return (min, max, mean, variance) of a column over a row range.
+        rising(column, lookback): Return the (cached) mask of rows that rose over a lookback.
+        above_average(column): Return the (cached) mask of rows at or above their running average.
+        signal_index(column): Return the (cached) index of the signal rows of a strategy column.
+    """
+
+    def __init__(self, path, mtime, df, loader=None, ohlc=None, range_indexes=None):
+        """
+        Initialize a DayData instance.
+
+        Args:
+            path (str): Path of the CSV file the data was read from.
+            mtime (float): Modification time of the file when it was read.
+            df (pandas.DataFrame): The parsed day frame, indexed by 'DateTime'.
+            loader (callable, optional): Called with a list of column names, returns the arrays of those
+                                         the day has as a dict. Needed to add columns later. Default is None.
+            ohlc (dict, optional): OHLC frames already built while reading, keyed by (column, rule). Default is None.
+            range_indexes (dict, optional): BlockRangeIndex per column already built while reading. Default is None.
+        """
+        self.path = path
+        self.mtime = mtime
+        self.df = df
+        self.meta = DayMeta(df.index)
+        self.refcount = 0
+        self.prefetched = False
+        self._ohlc = dict(ohlc or {})
+        self._range_indexes = dict(range_indexes or {})
+        self._masks = {}  # Colour masks and signal indexes, keyed by kind, column (and lookback).
+        self._loader = loader
+        self._absent = set()  # Requested columns the day does not have.
+        self._lock = threading.Lock()
+
+    def ensure_columns(self, columns):
+        """
+        Load the given columns if the frame does not hold them yet.
+
+        The frame is replaced by a new one holding the old and new columns; no column data is copied,
+        so holders should always read the frame through the day (day.df) rather than keep it.
+
+        Args:
+            columns (list[str]): The column names needed. Names the day does not have are ignored.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            missing = [name for name in dict.fromkeys(columns)
+                       if name not in self.df.columns and name not in self._absent]
+            if not missing or self._loader is None:
+                return
+            loaded = self._loader(missing)
+            self._absent.update(name for name in missing if name not in loaded)
+            if not loaded:
+                return
+
+            merged = {name: self.df[name].to_numpy() for name in self.df.columns}
+            merged.update(loaded)
+            self.df = frame_from_columns(self.df.index.asi8, merged)
+
+    def prepare(self):
+        """
+        Compute everything a graph needs when it switches to this day, so the switch itself is cheap.
+
+        Returns:
+            None
+        """
+        if 'Price' in self.df.columns:
+            self.ohlc('Price', BAR_RULES[0])
+
+    def ohlc(self, column='Price', rule='5T'):
+        """
+        Return the OHLC bars for a column, resampling only the first time they are requested.
+
+        The levels of the bar pyramid (core.bars.BAR_RULES) are resampled once at the finest
+        level and aggregated from the next finer level from there on.
+
+        Args:
+            column (str, optional): The column to aggregate. Default is 'Price'.
+            rule (str, optional): The pandas resample rule. Default is '5T'.
+
+        Returns:
+            pandas.DataFrame: A frame with 'Open', 'High', 'Low' and 'Close' columns.
+        """
+        key = (column, rule)
+        if key not in self._ohlc and rule in BAR_RULES[1:]:
+            finer = BAR_RULES[BAR_RULES.index(rule) - 1]
+            self._ohlc[key] = aggregate_bars(self.ohlc(column, finer), rule)
+        elif key not in self._ohlc:
+            ohlc_data = self.df.resample(rule).agg({column: ['first', 'max', 'min', 'last']})
+            ohlc_data.columns = ['Open', 'High', 'Low', 'Close']
+            ohlc_data.dropna(inplace=True)  # Drop any empty intervals.
+            self._ohlc[key] = ohlc_data
+        return self._ohlc[key]
+
+    def ohlc_range(self, column, start, stop, rule='5T'):
+        """
+        Return the OHLC bars of a range of rows, sliced from the day's cached bars.
+
+        For pyramid levels, bars cut by the range edges are rebuilt from the next finer level,
+        so the cost does not grow with the level.
+
+        Args:
+            column (str): The column to aggregate.
+            start (int): First row of the range.
+            stop (int): One past the last row of the range.
+            rule (str, optional): The pandas resample rule. Default is '5T'.
+
+        Returns:
+            pandas.DataFrame: A frame with 'Open', 'High', 'Low' and 'Close' columns.
+        """
+        edge_bars = None
+        if rule in BAR_RULES[1:]:
+            finer = BAR_RULES[BAR_RULES.index(rule) - 1]
+            edge_bars = lambda first, last: self.ohlc_range(column, first, last, finer)
+        return ohlc_slice(self.ohlc(column, rule), self.meta.timestamps, self.df[column].to_numpy(),
+                          start, stop, rule, edge_bars)
+
+    def value_range(self, column, start, stop):
+        """
+        Return the minimum and maximum of a column over a row range, using a per-block index
+        (see core.range_index.BlockRangeIndex) built the first time the column is queried (or
+        while the day was read).
+
+        Args:
+            column (str): The column name.
+            start (int): First row of the range.
+            stop (int): One past the last row of the range.
+
+        Returns:
+            tuple: (min, max), both NaN if the range holds no values.
+        """
+        return self._range_index(column).value_range(self.df[column].to_numpy(), start, stop)
+
+    def value_stats(self, column, start, stop):
+        """
+        Return the minimum, maximum, mean and variance of a column over a row range, in constant
+        time through the same index as value_range.
+
+        Args:
+            column (str): The column name.
+            start (int): First row of the range.
+            stop (int): One past the last row of the range.
+
+        Returns:
+            tuple: (min, max, mean, variance), all NaN if the range holds no values.
+        """
+        return self._range_index(column).value_stats(self.df[column].to_numpy(), start, stop)
+
+    def _range_index(self, column):
+        """
+        Return the range index of a column, building it the first time the column is queried.
+        """
+        index = self._range_indexes.get(column)
+        if index is None:
+            index = self._range_indexes[column] = BlockRangeIndex(self.df[column].to_numpy())
+        return index
+
+    def rising(self, column, lookback):
+        """
+        Return which rows of a column are higher than the row lookback places before them,
+        computed once per column and lookback.
+
+        Args:
+            column (str): The column name.
+            lookback (int): How many rows back to compare with.
+
+        Returns:
+            numpy.ndarray: A read-only boolean mask (see core.colors.rising_mask).
+        """
+        key = ('rising', column, lookback)
+        if key not in self._masks:
+            mask = rising_mask(self.df[column].to_numpy(), lookback)
+            mask.flags.writeable = False  # Shared by every holder of the day.
+            self._masks[key] = mask
+        return self._masks[key]
+
+    def above_average(self, column):
+        """
+        Return which rows of a column are at or above the average of the rows before them,
+        computed once per column.
+
+        Args:
+            column (str): The column name.
+
+        Returns:
+            numpy.ndarray: A read-only boolean mask (see core.colors.above_average_mask).
+        """
+        key = ('above_average', column)
+        if key not in self._masks:
+            mask = above_average_mask(self.df[column].to_numpy())
+            mask.flags.writeable = False
+            self._masks[key] = mask
+        return self._masks[key]
+
+    def signal_index(self, column):
+        """
+        Return the index of the non-zero rows of a strategy column, built once per column.
+
+        Args:
+            column (str): The strategy column name.
+
+        Returns:
+            SignalIndex: The signal rows and values of the day.
+        """
+        key = ('signals', column)
+        if key not in self._masks:
+            self._masks[key] = SignalIndex(self.df[column].to_numpy())
+        return self._masks[key]
+
+
+def frame_from_columns(timestamps, columns):
+    """
+    Wrap epoch timestamps and column arrays in a read-only frame indexed by 'DateTime'.
+
+    Args:
+        timestamps (numpy.ndarray): int64 epoch nanoseconds.
+        columns (dict): Column name to numpy array.
+
+    Returns:
+        pandas.DataFrame: The day frame. No column data is copied.
+    """
+    index = pd.DatetimeIndex(np.asarray(timestamps).view('datetime64[ns]'), name='DateTime')
+
+    for values in columns.values():
+        values.flags.writeable = False
+
+    # copy=False keeps one block per column, so the read-only (memory-mapped) arrays are used as-is.
+    return pd.DataFrame(columns, index=index, copy=False)
+
+
+def read_day(path, columns=None, on_chunk=None, progress=None):
+    """
+    Load a day into a read-only frame indexed by 'DateTime'.
+
+    The columns come from the binary columnar cache of the CSV (see data.ingest), so only the
+    first read of a column pays for CSV and datetime parsing.
+
+    Args:
+        path (str): Path to the day CSV.
+        columns (list[str], optional): Only load these columns. Default is every column.
+        on_chunk (callable, optional): Called with (timestamps, columns) of newly converted data. Default is None.
+        progress (callable, optional): Called with the fraction of the file converted so far. Default is None.
+
+    Returns:
+        pandas.DataFrame: The parsed frame.
+    """
+    return frame_from_columns(*load_day(path, columns, on_chunk, progress))
+
+
+def _archived_columns(archive, day, columns=None):
+    """
+    Return zero-copy (timestamps, columns) views of an archived day, keeping only the given columns.
+    """
+    timestamps, day_columns = archive.day_columns(day)
+    if columns is not None:
+        day_columns = {name: day_columns[name] for name in columns if name in day_columns}
+    return timestamps, day_columns
+
+
+def find_archived_day(path):
+    """
+    Return the strategy archive holding the day a DayN.csv path refers to, if there is one and the
+    CSV was not edited since the archive was built.
+
+    Args:
+        path (str): Path to a day CSV, e.g. ./data/strategy_zero/Day3.csv. The CSV itself need not exist.
+
+    Returns:
+        tuple: (DayArchive, day number), or (None, None) if the day is not archived or its archived copy is stale.
+    """
+    directory, filename = os.path.split(os.path.normpath(path))
+    match = DAY_FILE_PATTERN.match(filename)
+    if not match:
+        return None, None
+
+    archive = open_archive(directory)
+    day = int(match.group(1))
+    if archive is None or not archive.is_current(day, path):
+        return None, None
+    return archive, day
+
+
+class DayStore:
+    """
+    A process-wide, reference-counted cache of parsed day files.
+
+    Days are keyed by (path, mtime), so every graph showing the same file shares one frame and
+    an edited file is re-read on the next acquire. Days nobody holds any more are kept around
+    for quick switching back and evicted least-recently-used first.
+
+    Callers name the columns they display, and only those are read; a later caller needing other
+    columns of a cached day has them added to the shared frame.
+
+    Methods:
+        acquire(path, columns): Return the shared DayData for a file and take a reference to it.
+        preload(path, columns): Read and prepare a day into the cache without taking a reference.
+        release(day): Drop a reference taken with acquire.
+        contains(path): Return True if a file's current version is cached or being read.
+        keep_idle(owner, count): Keep more unreferenced days cached on an owner's behalf.
+        clear(): Forget every cached day.
+    """
+
+    def __init__(self, max_idle=4):
+        """
+        Initialize a DayStore.
+
+        Args:
+            max_idle (int, optional): How many unreferenced days to keep cached. Default is 4.
+        """
+        self.max_idle = max_idle
+        self._days = OrderedDict()  # (path, mtime) -> DayData, least recently used first
+        self._loading = {}  # (path, mtime) -> Future of a day being read by some thread
+        self._idle_requests = {}  # id(owner) -> unreferenced days the owner asked to keep (see keep_idle)
+        self._lock = threading.Lock()
+
+        # A prefetch hit is a day whose first acquire found it already prepared by preload;
+        # a miss is a day that had to be read by acquire itself.
+        self.prefetch_hits = 0
+        self.misses = 0
+
+    def acquire(self, path, columns=None, progress=None):
+        """
+        Return the shared DayData for a file, reading it only if it is not cached yet.
+
+        If the strategy directory has an archive (see data.archive) holding the day, the day is sliced
+        out of the memory-mapped archive instead, and the CSV does not need to exist. If another thread
+        is already reading the day, this waits for it instead of reading it twice.
+
+        Args:
+            path (str): Path to the day CSV.
+            columns (list[str], optional): The columns the caller needs. Default is every column.
+            progress (callable, optional): Called with the fraction of the file read so far, if it has to
+                                           be converted. Default is None.
+
+        Returns:
+            DayData: The shared day data. Callers must hand it back with release.
+
+        Raises:
+            FileNotFoundError: If the file does not exist and the day is not archived.
+        """
+        day, loaded_here = self._get_or_load(path, columns=columns, progress=progress)
+        day.ensure_columns(columns if columns is not None else self._all_columns(path))
+
+        with self._lock:
+            if loaded_here:
+                self.misses += 1
+            elif day.prefetched:
+                self.prefetch_hits += 1
+            day.prefetched = False
+            day.refcount += 1
+            self._evict()
+        return day
+
+    def preload(self, path, columns=None):
+        """
+        Read and prepare a day into the cache without taking a reference to it. Safe to call from
+        worker threads.
+
+        Args:
+            path (str): Path to the day CSV.
+            columns (list[str], optional): The columns to read. Default is every column.
+
+        Raises:
+            FileNotFoundError: If the file does not exist and the day is not archived.
+        """
+        day, _ = self._get_or_load(path, prefetched=True, columns=columns)
+        day.ensure_columns(columns if columns is not None else self._all_columns(path))
+        with self._lock:
+            self._evict()
+
+    def _get_or_load(self, path, prefetched=False, columns=None, progress=None):
+        """
+        Return the cached day of a file, reading and preparing it first if needed.
+
+        Args:
+            path (str): Path to the day CSV.
+            prefetched (bool, optional): Mark a day read by this call as prefetched. Default is False.
+            columns (list[str], optional): The columns to read if the day is read. Default is every column.
+            progress (callable, optional): Passed to read_day. Default is None.
+
+        Returns:
+            tuple: (DayData, True if this call read the day).
+        """
+        norm_path = os.path.normpath(path)
+        archive, archived_day = find_archived_day(norm_path)
+        key = self._key(norm_path, archive)
+
+        with self._lock:
+            day = self._days.get(key)
+            if day is not None:
+                self._days.move_to_end(key)
+                return day, False
+            future = self._loading.get(key)
+            if future is None:
+                future = self._loading[key] = Future()
+                loading_here = True
+            else:
+                loading_here = False
+
+        if not loading_here:
+            return future.result(), False
+
+        try:
+            # Bars and range indexes are built from the chunks as a CSV is converted, so large
+            # days need no second pass over the data.
+            bars = OhlcBuilder(BAR_RULES[0])
+            range_indexes = {}
+
+            def on_chunk(timestamps, chunk_columns):
+                if 'Price' in chunk_columns:
+                    bars.append(timestamps, chunk_columns['Price'])
+                for name, values in chunk_columns.items():
+                    range_indexes.setdefault(name, BlockRangeIndex()).append(values)
+
+            if archive is not None:
+                # Zero-copy slices of the archive.
+                df = frame_from_columns(*_archived_columns(archive, archived_day, columns))
+                loader = lambda names: _archived_columns(archive, archived_day, names)[1]
+            else:
+                df = read_day(norm_path, columns, on_chunk, progress)
+                loader = lambda names: load_day(norm_path, names)[1]
+
+            # Only keep what was built from the whole of a column.
+            ohlc = {('Price', BAR_RULES[0]): bars.result()} if 'Price' in df.columns and bars.rows == len(df) else {}
+            range_indexes = {name: index for name, index in range_indexes.items()
+                             if name in df.columns and index.rows == len(df)}
+            day = DayData(path, key[1], df, loader, ohlc, range_indexes)
+            day.prepare()
+            day.prefetched = prefetched
+        except BaseException as e:
+            with self._lock:
+                del self._loading[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._days[key] = day
+            del self._loading[key]
+        future.set_result(day)
+        return day, True
+
+    @staticmethod
+    def _key(norm_path, archive):
+        """
+        Return the cache key of the current version of a day: (path, mtime of its archive or CSV).
+
+        Raises:
+            FileNotFoundError: If the day is not archived and its CSV does not exist.
+        """
+        if archive is not None:
+            return norm_path, archive.mtime
+        return norm_path, os.path.getmtime(norm_path)
+
+    def _all_columns(self, path):
+        """
+        Return every column name of a day, for callers that did not name the columns they need.
+        """
+        archive, archived_day = find_archived_day(path)
+        if archive is not None:
+            return list(_archived_columns(archive, archived_day)[1])
+        return column_names(path)
+
+    def release(self, day):
+        """
+        Drop a reference taken with acquire. The day stays cached until it is evicted.
+
+        Args:
+            day (DayData): The day to release. None is ignored.
+        """
+        if day is None:
+            return
+        with self._lock:
+            day.refcount = max(0, day.refcount - 1)
+            key = (os.path.normpath(day.path), day.mtime)
+            if key in self._days:
+                self._days.move_to_end(key)
+            self._evict()
+
+    def contains(self, path):
+        """
+        Return True if a file's current version is cached or being read. A version read before the
+        file was edited does not count.
+
+        Args:
+            path (str): Path to the day CSV.
+
+        Returns:
+            bool: Whether acquiring the file would avoid a synchronous read.
+        """
+        norm_path = os.path.normpath(path)
+        try:
+            key = self._key(norm_path, find_archived_day(norm_path)[0])
+        except FileNotFoundError:
+            return False
+        with self._lock:
+            return key in self._days or key in self._loading
+
+    def keep_idle(self, owner, count):
+        """
+        Ask the store to keep at least count unreferenced days cached for an owner, e.g. a prefetch
+        window, on top of max_idle. The largest request of all owners applies.
+
+        Args:
+            owner: The object asking; each owner holds one request.
+            count (int): The number of days, 0 to withdraw the request.
+        """
+        with self._lock:
+            if count:
+                self._idle_requests[id(owner)] = count
+            else:
+                self._idle_requests.pop(id(owner), None)
+            self._evict()
+
+    def clear(self):
+        """
+        Forget every cached day. Holders keep their frames, they just stop being shared.
+        """
+        with self._lock:
+            self._days.clear()
+
+    def _evict(self):
+        """
+        Drop stale versions of re-written files and the least recently used idle days.
+        Must be called with the lock held.
+        """
+        latest = {}
+        for path, mtime in self._days:
+            latest[path] = max(mtime, latest.get(path, mtime))
+
+        idle = [key for key, day in self._days.items() if day.refcount == 0]
+        for key in idle:
+            if key[1] != latest[key[0]]:
+                del self._days[key]
+        idle = [key for key in idle if key in self._days]
+
+        while len(idle) > max([self.max_idle, *self._idle_requests.values()]):
+            del self._days[idle.pop(0)]
+
+
+# The store shared by every Graph in the process.
+day_store = DayStore()
@@ -1,9 +1,11 @@
 from utils.uiux import UIElement
 from utils.observering import Observable
+from utils.text_cache import text_cache
 import pygame
-import os
 from core.graph import Graph
-import pandas as pd
+from core.day_manifest import get_manifest
+from core.prefetch import DayPrefetcher
+from core.loading import day_loader
 
 class DaySwitch(UIElement, Observable):
     """
@@ -33,19 +35,29 @@ class DaySwitch(UIElement, Observable):
         Bounding rectangle for the entire DaySwitch element.
     strategy_dir : str
         Directory name where strategy data is stored.
+    prefetcher : DayPrefetcher
+        Observer that prepares the neighbouring days in the background.
 
     Methods
     -------
     display(screen)
         Renders the DaySwitch UI onto the provided screen.
+    render_state()
+        Returns what a frame of the DaySwitch shows.
+    dirty_rect()
+        Returns the screen area the DaySwitch draws on.
     clear_graphs()
         Clears the list of associated graphs.
     add_graphs(graphs)
         Extends the list of associated graphs.
+    data_columns()
+        Returns the data columns read by the associated graphs.
     check_click(pos)
         Handles click events on the DaySwitch UI.
     _move_day(direction)
         Changes the current day in the given direction.
+    shutdown()
+        Stops prefetching the neighbouring days.
     serialize()
         Serializes the DaySwitch instance into a dictionary.
     deserialize(data, graphs=[])
@@ -68,16 +80,18 @@ class DaySwitch(UIElement, Observable):
         graphs : list[Graph], optional
             List of associated Graph objects.
         max_days : int, optional
-            Maximum number of days to be displayed. Default is 99.
+            Largest day number expected; only used to size the element. Default is 99.
         strategy_dir : str, optional
             Name of the directory where strategy data is stored. Default is 'strategy_zero'.
         show_date : bool, optional
             Whether the date should be displayed or not. Default is True.
         """
         super().__init__(x, y)
+        Observable.__init__(self)
         self.show_date = show_date
         self.max_days = max_days
         self.current_day = 1
+        self._target_day = 1  # The day being loaded, current once its load is delivered
         self.font = pygame.font.SysFont('arial', 16)  # Increased the font size
 
         self.arrow_size = 20  # Increased from 20 to 80
@@ -97,6 +111,13 @@ class DaySwitch(UIElement, Observable):
         self.strategy_dir = strategy_dir
         self.show_date = show_date
 
+        # Prepare the neighbouring days in the background whenever the current day changes,
+        # reading only the columns the graphs display.
+        self.prefetcher = DayPrefetcher(strategy_dir, columns=self.data_columns())
+        self.add_observer(self.prefetcher)
+        if self.graphs:
+            self.notify_observers(self.current_day)
+
     def display(self, screen):
         """
         Renders the DaySwitch UI onto the provided screen.
@@ -127,19 +148,50 @@ class DaySwitch(UIElement, Observable):
         screen.blit(arrow_surface, (self.x, self.y))
 
         # Render the text directly onto the main screen (opaque)
-        if hasattr(self, 'show_date') and self.show_date and self.graphs:
-            df = pd.read_csv(self.graphs[0].df_path)
-            day_str = str(df.iloc[0]["DateTime"].split(' ')[0])
-        else:
-            day_str = f"Day {self.current_day}"
+        day_text = text_cache.render(self.font, self._day_label(), (0, 0, 0))  # RGB for opaque black text
+        screen.blit(day_text, self._label_position(day_text.get_width()))
 
-        day_text = self.font.render(day_str, True, (0, 0, 0))  # RGB for opaque black text
+    def _day_label(self):
+        """
+        Returns the text shown below the arrows: the session date, or the day number.
+        """
+        if hasattr(self, 'show_date') and self.show_date and self.graphs and self.graphs[0].day is not None:
+            # The session date is computed once when the day is loaded.
+            return self.graphs[0].day.meta.session_date
+        return f"Day {self.current_day}"
 
-        # Calculate the midpoint between the arrows and blit the text
+    def _label_position(self, text_width):
+        """
+        Returns the top-left corner of a label of the given width, centred between the arrows.
+        """
         arrow_midpoint = self.left_arrow_rect.right + (self.right_arrow_rect.left - self.left_arrow_rect.right) / 2
-        text_x = arrow_midpoint - day_text.get_width() // 2
+        text_x = arrow_midpoint - text_width // 2
         text_y = self.y + self.arrow_size + self.padding  # Below the arrows
-        screen.blit(day_text, (text_x, text_y))
+        return text_x, text_y
+
+    def render_state(self):
+        """
+        Returns what a frame of the DaySwitch shows, so unchanged frames need not be repainted.
+
+        Returns
+        -------
+        tuple
+            The position and the label text.
+        """
+        return self.x, self.y, self._day_label()
+
+    def dirty_rect(self):
+        """
+        Returns the screen area the DaySwitch draws on: the arrows and the label below them.
+
+        Returns
+        -------
+        pygame.Rect
+            The bounding rectangle.
+        """
+        text_width, text_height = self.font.size(self._day_label())
+        text_x, text_y = self._label_position(text_width)
+        return self.rect.union(pygame.Rect(int(text_x) - 1, text_y, text_width + 2, text_height))
 
     def clear_graphs(self):
         """
@@ -157,6 +209,19 @@ class DaySwitch(UIElement, Observable):
             A list of Graph objects to be added.
         """
         self.graphs.extend(graphs)
+        self.prefetcher.columns = self.data_columns()
+        self.notify_observers(self.current_day)
+
+    def data_columns(self):
+        """
+        Returns the data columns read by the associated graphs.
+
+        Returns
+        -------
+        list[str]
+            The union of the graphs' columns, in first-seen order.
+        """
+        return list(dict.fromkeys(column for graph in self.graphs for column in graph.data_columns()))
 
 
     def check_click(self, pos):
@@ -179,29 +244,64 @@ class DaySwitch(UIElement, Observable):
         """
         Changes the current day based on the given direction.
 
-        If the data for the new day doesn't exist, it continues moving in the same direction until a valid day is found.
+        The next available day is found by a binary search over the strategy's day manifest, skipping
+        missing day numbers and wrapping around at either end. Archived days are included.
 
         Parameters
         ----------
         direction : int
             An integer indicating the direction to move. Negative for moving back and positive for moving forward.
         """
-        self.current_day += direction
-        if self.current_day > self.max_days:
-            self.current_day = 1
-        elif self.current_day < 1:
-            self.current_day = self.max_days
+        # Clicks made while a day is still loading move on from that day, not the one shown.
+        from_day = self._target_day if self.is_loading else self.current_day
+        new_day = get_manifest(f"./data/{self.strategy_dir}").next_day(from_day, direction)
+        if new_day is None:
+            print(f"Warning: No days found for strategy {self.strategy_dir}.")
+            return
+        self._set_day(new_day)
+
+    def _set_day(self, day):
+        """
+        Starts loading the given day for every associated graph and makes it current once loaded.
 
-        # Check if directory exists, otherwise wrap around
-        while not os.path.exists(f"./data/{self.strategy_dir}/Day{self.current_day}.csv"):
-            self.current_day += direction
-            if self.current_day > self.max_days:
-                self.current_day = 1
-            elif self.current_day < 1:
-                self.current_day = self.max_days
+        The load runs in the shared DayLoader's 'day' slot; the graphs keep showing the previous
+        day until the render loop polls the loader and all of them are swapped together. Only then
+        do current_day and the observers change, so a dropped load leaves both on the shown day.
 
-        for graph in self.graphs:
-            graph.set_data_file(self.current_day)
+        Parameters
+        ----------
+        day : int
+            The day number.
+        """
+        self._target_day = day
+        graphs = [graph for graph in self.graphs if graph.data_filename]
+        paths = [graph.day_path(day) for graph in graphs]
+
+        def swap_graphs(days):
+            for graph, path, new_day in zip(graphs, paths, days):
+                graph.swap_day(new_day, path)
+            self.current_day = day
+            self.notify_observers(self.current_day)
+
+        columns = self.data_columns()
+        self.prefetcher.columns = columns
+        day_loader.submit(paths, swap_graphs, columns, slot='day')
+
+    @property
+    def is_loading(self):
+        """
+        bool: True while a day change is still being loaded.
+        """
+        return day_loader.is_pending('day')
+
+    def shutdown(self):
+        """
+        Stops prefetching the neighbouring days. Call this when the DaySwitch is dropped or replaced,
+        so its worker threads and its share of the day store go with it.
+        """
+        if self.prefetcher in self._observers:
+            self.remove_observer(self.prefetcher)
+        self.prefetcher.shutdown()
 
     def serialize(self):
         """
@@ -248,6 +348,8 @@ class DaySwitch(UIElement, Observable):
 
         day_switch = DaySwitch(x, y, graphs=graphs, max_days=max_days, strategy_dir=strategy_dir)
         day_switch.current_day = current_day
+        if graphs:
+            day_switch.notify_observers(current_day)
 
         # Ensure that the clickable regions are updated based on the loaded position:
         day_switch.left_arrow_rect = pygame.Rect(x, y, day_switch.arrow_size, day_switch.arrow_size)
@@ -0,0 +1,82 @@
+import numpy as np
+
+
+def pixel_columns(count, width):
+    """
+    Return the pixel column every point of a series falls in when it is stretched over a width.
+
+    Args:
+        count (int): The number of points.
+        width (int): The width in pixels.
+
+    Returns:
+        numpy.ndarray: The column of every point, 0 to width.
+    """
+    if count < 2:
+        return np.zeros(count, dtype=np.int64)
+    return np.arange(count) * width // (count - 1)
+
+
+def minmax_indices(values, width):
+    """
+    Reduce a series to the points that shape it at a given pixel width: the minimum and maximum
+    of every pixel column, in their original order, plus the first and last points.
+
+    Drawn as a line, the result covers the same pixels as the full series, but has at most about
+    2 * width points.
+
+    Args:
+        values (numpy.ndarray): The series.
+        width (int): The width the series is drawn at, in pixels.
+
+    Returns:
+        numpy.ndarray: The sorted indices of the points to keep.
+    """
+    count = len(values)
+    if count <= 2 * width:
+        return np.arange(count)
+
+    columns = pixel_columns(count, width)
+    # Sorting by (column, value) puts every column's minimum first and its maximum last.
+    order = np.lexsort((values, columns))
+    starts = np.flatnonzero(np.r_[True, columns[order][1:] != columns[order][:-1]])
+    ends = np.r_[starts[1:], count] - 1
+    return np.unique(np.concatenate(([0, count - 1], order[starts], order[ends])))
+
+
+def lttb_indices(values, threshold):
+    """
+    Reduce a series with Largest-Triangle-Three-Buckets: keep the first and last points and, from
+    each of threshold - 2 buckets, the point forming the largest triangle with the point kept
+    before it and the average of the next bucket.
+
+    LTTB keeps the visual shape with fewer points than min/max decimation, but can drop short
+    spikes.
+
+    Args:
+        values (numpy.ndarray): The series.
+        threshold (int): The number of points to keep.
+
+    Returns:
+        numpy.ndarray: The sorted indices of the points to keep.
+    """
+    count = len(values)
+    if threshold >= count or threshold < 3:
+        return np.arange(count)
+
+    edges = np.linspace(1, count - 1, threshold - 1).astype(np.int64)
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, count - 1
+    x = np.arange(count, dtype=np.float64)
+    for bucket in range(threshold - 2):
+        first, last = edges[bucket], edges[bucket + 1]
+        next_first, next_last = last, edges[bucket + 2] if bucket + 2 < len(edges) else count
+        average_x = x[next_first:next_last].mean()
+        average_y = values[next_first:next_last].mean()
+
+        previous = kept[bucket]
+        # Twice the triangle areas, for every candidate in the bucket at once.
+        areas = np.abs((x[previous] - average_x) * (values[first:last] - values[previous])
+                       - (x[previous] - x[first:last]) * (average_y - values[previous]))
+        kept[bucket + 1] = first + int(np.argmax(areas))
+    return kept
@@ -1,13 +1,20 @@
 import time
 from utils.strategy_rules import Strategy
 import pygame
+import numpy as np
 import pandas as pd
 from core.clock import Clock
 from utils.observering import Observer, Observable
 from utils.uiux import UIElement
 # from analysis.slider import Slider
 from utils.mini_button import TextButton
+from utils.text_cache import text_cache
 # from analysis.table import DataTable
+from core.day_store import day_store
+from core.bars import BAR_LABELS, BAR_RULES, pick_bar_rule
+from core.decimation import lttb_indices, minmax_indices
+from core.colors import DEFAULT_LOOKBACK, PROFIT_COLORS, rising_mask, window_profit_mask
+from core.label_layout import layout_labels
 import os
 # Colors
 WHITE = (255, 255, 255)
@@ -34,7 +41,8 @@ class Graph(UIElement, Observer, Observable):
         __init__(self, is_live=False, data_file=None, column='Price',
                  size_multiplier=1.0, y_offset_percentage=0.6,
                  x=None, y=None, width=None, height=None, color=(0, 0, 255),
-                 title='', original_title='', strategy_active=False, strategy_name='Strategy', prof_coloring=False, bar_chart=0, grid=True, font=None)
+                 title='', original_title='', strategy_active=False, strategy_name='Strategy', prof_coloring=False, bar_chart=0, grid=True, font=None,
+                 bar_rule=None, lookback_period=DEFAULT_LOOKBACK)
         setup_grid(self)
         create_toggle_buttons(self)
         _create_button(self, text, position, width, height, callback)
@@ -43,13 +51,24 @@ class Graph(UIElement, Observer, Observable):
         toggle_bar(self)
         toggle_strategy(self)
         toggle_color(self)
+        toggle_timeframe(self)
+        timeframe_label(self)
+        current_bar_rule(self, start_idx, end_idx)
+        decimated_indices(self, values, start_idx, end_idx)
+        columns_for(column, strategy_name)
+        data_columns(self)
         calculate_colors(self)
         set_highlight_index(self, index)
         get_overlapping_graphs(self, all_graphs)
         display(self, screen, all_graphs=[])
+        layer_key(self)
+        invalidate(self)
         render_transparent_text(self, surface, text, font, color, position, alpha)
         compute_moving_average(self, window_size=3)
         set_data_file(self, day)
+        day_path(self, day)
+        swap_day(self, new_day, new_path)
+        release_data(self)
         update_position(self, dx, dy, other_graphs=[])
         update(self, value)
         update_range(self, start_idx, end_idx)
@@ -63,11 +82,16 @@ class Graph(UIElement, Observer, Observable):
     current_x_offset = 0  # Class variable to track x-offset for new graphs
     spacing = 20  # Space between each graph
     MARGIN = 10  # Margin for all sides
+    CANDLE_PIXELS = 4  # Target width per bar when the timeframe is picked automatically
+    DECIMATION = 'minmax'  # How line mode thins out ranges with more points than pixels: 'minmax', 'lttb' or None
+    LAYER_MARGIN = 40  # Room around the graph in its retained layer for the title, time labels and signal labels
+    LAYER_MARGIN_RIGHT = 80  # Room right of the graph for the value labels
 
     def __init__(self, is_live=False, data_file=None, column='Price',
                  size_multiplier=1.0, y_offset_percentage=0.6,
                  x=None, y=None, width=None, height=None, color=(0, 0, 255),
-                 title='', original_title='', strategy_active=False, strategy_name='Strategy', prof_coloring=False, bar_chart=0, grid=True, font=None):
+                 title='', original_title='', strategy_active=False, strategy_name='Strategy', prof_coloring=False, bar_chart=0, grid=True, font=None,
+                 bar_rule=None, lookback_period=DEFAULT_LOOKBACK):
         """
         Initialize a Graph instance.
 
@@ -89,6 +113,10 @@ class Graph(UIElement, Observer, Observable):
             bar_chart (int, optional): Flag indicating the type of chart (0 for line, 1 for candlestick, 2 for basic). Default is 0.
             grid (bool, optional): Flag indicating if the grid is enabled. Default is True.
             font (pygame.font.Font, optional): The font for text rendering. Default is None.
+            bar_rule (str, optional): The bar timeframe, one of core.bars.BAR_RULES. Default is None (picked
+                                      from the zoom level).
+            lookback_period (int, optional): How many points (or bars) back the profit colouring compares
+                                             with. Default is 5.
         """
         # Initialize the Graph instance.
         UIElement.__init__(self, x, y)  # Initialize UIElement base class.
@@ -99,14 +127,17 @@ class Graph(UIElement, Observer, Observable):
         self.is_live = is_live  # Flag indicating if the graph is live or static.
         self.size_multiplier = size_multiplier  # Multiplier to adjust the graph's display size.
 
+        self.df_path = data_file  # Store the data file path.
+        self.column = column  # Column of data to display on the graph.
+        self.strategy_name = strategy_name  # Default name for the strategy column.
+
+        # Shared day data from the process-wide store; graphs on the same file share one frame,
+        # holding only the columns the graphs on it display.
+        self.day = None
         try:
-            self.df = pd.read_csv(data_file) if data_file else None  # Read data from CSV file if provided.
+            self.day = day_store.acquire(data_file, self.data_columns()) if data_file else None
         except FileNotFoundError:
             print(f"Error: Data file {data_file} not found.")
-            self.df = None
-
-        self.df_path = data_file  # Store the data file path.
-        self.column = column  # Column of data to display on the graph.
 
         # Initialize graph dimensions and position
         if x is None or y is None or width is None or height is None:
@@ -138,7 +169,6 @@ class Graph(UIElement, Observer, Observable):
         self.title = [title, self.title_color]  # Graph title and its color.
         self.original_title = title  # Original title of the graph.
         self.data_filename = os.path.basename(data_file) if data_file else None  # Extract filename from data file path.
-        self.strategy_name = strategy_name  # Default name for the strategy column.
         self.strategy_active = False  # Flag indicating if the strategy is active.
         self.strategy_dir = data_file.split("/")[2]  # Extract directory from data file path.
 
@@ -152,25 +182,22 @@ class Graph(UIElement, Observer, Observable):
         self.display_range = (0, len(self.df) - 1) if self.df is not None else (0, 0)
 
         self.prof_coloring = prof_coloring  # Flag for profit-based coloring of the graph.
-
-        # Calculate colors for the graph
-        self.colors = self.calculate_colors()
+        self.lookback_period = max(1, int(lookback_period))  # Points (or bars) the profit coloring compares with.
 
         self.bar_chart = bar_chart  # Type of chart to display (0: Candlestick, 1: OHLC, 2: Line).
+        self.bar_rule = bar_rule  # Bar timeframe; None picks one from the zoom level.
+        self._decimated = (None, None)  # (cache key, point indices) of the last decimated line.
+        self._label_layout = (None, None)  # (cache key, placed labels) of the last signal label layout.
 
-        self.df['DateTime'] = pd.to_datetime(self.df['DateTime'],
-                                             format='%m/%d/%Y %H:%M')  # Convert 'DateTime' to datetime.
-
-        # Assuming 'DateTime' column is of type datetime64, set it as the index.
-        self.df.set_index('DateTime', inplace=True)
-
-        # Resample in 5-minute intervals and compute OHLC data
-        self.ohlc_data = self.df.resample('5T').agg({
-            'Price': ['first', 'max', 'min', 'last']
-        })
+        # Retained layer with everything but the highlight point, redrawn only when layer_key() changes.
+        self._layer = None
+        self._layer_key = None
+        self._scale = None  # (min, max) of the displayed values when the layer was drawn.
+        # Tracked apart from the graph, so moving the highlight only repaints the point.
+        self.highlight_marker = HighlightMarker(self)
 
-        self.ohlc_data.columns = ['Open', 'High', 'Low', 'Close']
-        self.ohlc_data.dropna(inplace=True)  # Drop any empty intervals.
+        # 5-minute OHLC data, resampled once per day by the store.
+        self.ohlc_data = self.day.ohlc('Price', '5T')
 
         self.label_color = (192, 192, 192)  # Label color for the graph.
 
@@ -213,6 +240,7 @@ class Graph(UIElement, Observer, Observable):
         self.toggle_button_chart = self._create_button(self.x + 150, "Candle", self.toggle_bar)
         self.toggle_button_strategy = self._create_button(self.x + 225, "Indicators Off", self.toggle_strategy)
         self.toggle_button_color = self._create_button(self.x + 350, "RG Color", self.toggle_color)
+        self.toggle_button_timeframe = self._create_button(self.x + 440, self.timeframe_label(), self.toggle_timeframe)
 
 
     def _create_button(self, x_pos, label, action):
@@ -317,27 +345,152 @@ class Graph(UIElement, Observer, Observable):
         self.toggle_button_color.image = self.toggle_button_color.font.render(self.toggle_button_color.text, True,
                                                                   self.toggle_button_color.color)
 
+    def toggle_timeframe(self):
+        """
+        Cycle the bar timeframe through automatic and every pyramid level, and update the button text.
+
+        Returns:
+            None
+        """
+        choices = [None] + list(BAR_RULES)
+        self.bar_rule = choices[(choices.index(self.bar_rule) + 1) % len(choices)]
+        self.toggle_button_timeframe.text = self.timeframe_label()
+        self.toggle_button_timeframe.image = self.toggle_button_timeframe.font.render(
+            self.toggle_button_timeframe.text, True, self.toggle_button_timeframe.color)
+
+    def timeframe_label(self):
+        """
+        Return the timeframe button text.
+
+        Returns:
+            str: 'Auto' or the label of the selected timeframe.
+        """
+        return BAR_LABELS[self.bar_rule] if self.bar_rule else "Auto"
+
+    def current_bar_rule(self, start_idx, end_idx):
+        """
+        Return the bar timeframe to draw a row range with: the selected one, or the finest pyramid level
+        that fits the graph width at CANDLE_PIXELS per bar.
+
+        Args:
+            start_idx (int): First displayed row.
+            end_idx (int): Last displayed row.
+
+        Returns:
+            str: A rule from core.bars.BAR_RULES.
+        """
+        if self.bar_rule:
+            return self.bar_rule
+        timestamps = self.day.meta.timestamps
+        span = int(timestamps[end_idx] - timestamps[start_idx]) if end_idx > start_idx else 0
+        return pick_bar_rule(span, max(1, int(self.width // Graph.CANDLE_PIXELS)))
+
+    def decimated_indices(self, values, start_idx, end_idx):
+        """
+        Return the points of the displayed range to draw in line mode, thinned out to about two per
+        pixel column (see DECIMATION). The result is cached until the range, width or data change.
+
+        Args:
+            values (numpy.ndarray): The displayed values.
+            start_idx (int): First displayed row.
+            end_idx (int): Last displayed row.
+
+        Returns:
+            numpy.ndarray: The indices into values of the points to draw.
+        """
+        width = max(1, int(self.width))
+        key = (self.day.df, self.column, start_idx, end_idx, width, self.DECIMATION)
+        cached_key, indices = self._decimated
+        # The frame is compared by identity: a new day, or new columns, give a new frame.
+        if cached_key is not None and cached_key[0] is key[0] and cached_key[1:] == key[1:]:
+            return indices
+
+        if self.DECIMATION == 'minmax':
+            indices = minmax_indices(values, width)
+        elif self.DECIMATION == 'lttb':
+            indices = lttb_indices(values, 2 * width)
+        else:
+            indices = np.arange(len(values))
+        self._decimated = (key, indices)
+        return indices
+
+    def signal_label_layout(self, markers, y0):
+        """
+        Return where to draw the signal labels (see core.label_layout.layout_labels). The layout is
+        cached until the markers change, i.e. until the range, size or data change.
+
+        Args:
+            markers (list[tuple]): (x, y, label, color) of every labelled signal point.
+            y0 (int): y of the graph's top edge on the surface drawn on.
+
+        Returns:
+            list[tuple]: (text, color, top-left corner) of every label.
+        """
+        key = (self.font, y0, self.height, tuple(markers))
+        cached_key, layout = self._label_layout
+        if cached_key != key:
+            layout = layout_labels(markers, self.font, y0, self.height)
+            self._label_layout = (key, layout)
+        return layout
+
+    @property
+    def df(self):
+        """
+        pandas.DataFrame: The frame of the graph's day, or None if no day is loaded.
+        """
+        return self.day.df if self.day else None
+
+    @staticmethod
+    def columns_for(column='Price', strategy_name='Strategy'):
+        """
+        Return the data columns a graph displaying the given column reads.
+
+        Args:
+            column (str, optional): The displayed column. Default is 'Price'.
+            strategy_name (str, optional): The strategy signal column. Default is 'Strategy'.
+
+        Returns:
+            list[str]: The column names, without duplicates. 'Price' is always included since the
+                       bars and colors are computed from it.
+        """
+        return list(dict.fromkeys([column, strategy_name, 'Price']))
+
+    def data_columns(self):
+        """
+        Return the data columns this graph reads.
+
+        Returns:
+            list[str]: The column names.
+        """
+        return Graph.columns_for(self.column, self.strategy_name)
+
     def calculate_colors(self):
         """
-        Calculate colors for data points based on the previous average.
+        Calculate colors for data points based on the previous average: green when a price is at or
+        above the average of the prices before it, red otherwise. The mask is computed once per day.
 
         Returns:
-            List[tuple]: A list of RGB color tuples for each data point.
+            numpy.ndarray: A boolean mask, True (green) or False (red) for each data point.
         """
         if self.df is None or 'Price' not in self.df:
-            return []
+            return np.empty(0, dtype=bool)
+        return self.day.above_average('Price')
 
-        prices = self.df['Price'].tolist()
-        colors = []
+    def _bar_color_groups(self, closes):
+        """
+        Group bars by their color, so same-colored bars are drawn together. With profit coloring a bar
+        is green when its close is above the close lookback_period bars earlier, red otherwise.
 
-        # Compute the lookback for coloring
-        cum_sum = 0
-        for i, price in enumerate(prices):
-            cum_avg = cum_sum / (i+1) if i != 0 else price
-            color = (0, 255, 0) if price >= cum_avg else (255, 0, 0)
-            colors.append(color)
-            cum_sum += price
-        return colors
+        Args:
+            closes (numpy.ndarray): The closes of the displayed bars.
+
+        Returns:
+            list[tuple]: (color, indices of the bars drawn in it) pairs.
+        """
+        if not self.prof_coloring:
+            return [(self.color, np.arange(len(closes)))]
+        rising = rising_mask(closes, self.lookback_period)
+        return [(PROFIT_COLORS[0], np.flatnonzero(~rising)), (PROFIT_COLORS[1], np.flatnonzero(rising))]
 
     def set_highlight_index(self, index):
         """
@@ -363,12 +516,145 @@ class Graph(UIElement, Observer, Observable):
 
     def display(self, screen, all_graphs=[]):
         """
-        Display the graph on the given screen. This Function is scuffed but works.
+        Display the graph on the given screen.
+
+        The series, axes, labels, signals and grid are drawn into a retained layer that is only
+        redrawn when something it shows changes (see layer_key); a frame just blits it and draws
+        the highlight point.
 
         Args:
             screen (pygame.Surface): The Pygame surface to display the graph on.
             all_graphs (list): List of other graph objects for overlap detection.
 
+        Returns:
+            None
+        """
+        key = self.layer_key()
+        if self._layer is None or not self._same_layer_key(key):
+            self._layer_key = key
+            self._render_layer()
+        screen.blit(self._layer, (self.x - Graph.LAYER_MARGIN, self.y - Graph.LAYER_MARGIN))
+
+        self.rect = pygame.Rect(self.x - 5, self.y - 5, self.width + 10, self.height + 10)
+
+        self.draw_highlight(screen)
+
+    def draw_highlight(self, screen):
+        """
+        Draw the point of the highlighted index.
+
+        Args:
+            screen (pygame.Surface): The Pygame surface to draw on.
+
+        Returns:
+            None
+        """
+        position = self._highlight_position()
+        if position is not None:
+            pygame.draw.circle(screen, (255, 255, 255), position, self.point_radius * 1.2)
+
+    def _highlight_position(self):
+        """
+        Return the screen position of the highlight point, or None if there is nothing to highlight.
+        """
+        if self.df is None or self._scale is None:
+            return None
+        if self.highlight_index is None or not 0 <= self.highlight_index < len(self.df):
+            return None
+
+        start_idx, end_idx = self.display_range
+        min_val, max_val = self._scale
+        displayed_count = end_idx - start_idx + 1
+        relative_idx = self.highlight_index - start_idx
+        x_pos = self.x + (self.width / (displayed_count - 1) * relative_idx) if displayed_count > 1 else self.x
+
+        value = self.df[self.column].iloc[self.highlight_index]
+        value_normalized = (value - min_val) / (max_val - min_val) if max_val != min_val else 0.5
+        y_pos = self.y + self.height - (self.height * value_normalized)
+        return int(x_pos), int(y_pos)
+
+    def render_state(self):
+        """
+        Return everything a frame of the graph shows apart from the highlight point (see
+        highlight_marker), so the application can skip repainting it when nothing changed.
+
+        Returns:
+            tuple: The layer key (frame by identity), position and toggle button labels.
+        """
+        key = self.layer_key()
+        return ((id(key[0]),) + key[1:] + (self.x, self.y)
+                + tuple((button.text, button.rect.topleft) for button in self._toggle_buttons()))
+
+    def dirty_rect(self):
+        """
+        Return the screen area a frame of the graph draws on: its layer and toggle buttons.
+
+        Returns:
+            pygame.Rect: The bounding rectangle.
+        """
+        margin = Graph.LAYER_MARGIN
+        rect = pygame.Rect(self.x - margin, self.y - margin, int(self.width) + margin + Graph.LAYER_MARGIN_RIGHT,
+                           int(self.height) + 2 * margin)
+        rect.unionall_ip([button.rect for button in self._toggle_buttons()])
+        return rect
+
+    def _toggle_buttons(self):
+        """
+        Return the graph's toggle buttons.
+        """
+        return (self.toggle_button_grid, self.toggle_button_chart, self.toggle_button_strategy,
+                self.toggle_button_color, self.toggle_button_timeframe)
+
+    def layer_key(self):
+        """
+        Return everything the retained layer depends on; the layer is redrawn when this changes.
+
+        Returns:
+            tuple: The day frame followed by the range, size, colours and toggles.
+        """
+        return (self.df, self.column, self.display_range, self.width, self.height, self.color,
+                self.bar_chart, self.bar_rule, self.prof_coloring, self.lookback_period, self.strategy_active,
+                self.strategy_name,
+                self.grid, self.original_title, self.font, self.DECIMATION)
+
+    def _same_layer_key(self, key):
+        """
+        Return True if key matches the key the layer was drawn with. The frame is compared by identity.
+        """
+        return self._layer_key[0] is key[0] and self._layer_key[1:] == key[1:]
+
+    def invalidate(self):
+        """
+        Force the retained layer to be redrawn on the next display.
+
+        Returns:
+            None
+        """
+        self._layer = None
+
+    def _render_layer(self):
+        """
+        Draw the static part of the graph into a new layer surface, LAYER_MARGIN pixels larger than
+        the graph on every side (LAYER_MARGIN_RIGHT on the right, for the value labels).
+
+        Returns:
+            None
+        """
+        margin = Graph.LAYER_MARGIN
+        self._layer = pygame.Surface((int(self.width) + margin + Graph.LAYER_MARGIN_RIGHT,
+                                      int(self.height) + 2 * margin), pygame.SRCALPHA)
+        self._scale = None
+        self._draw_static(self._layer, margin, margin)
+
+    def _draw_static(self, surface, x0, y0):
+        """
+        Draw the series, axes, labels, signals and grid with the graph's top-left corner at (x0, y0).
+
+        Args:
+            surface (pygame.Surface): The surface to draw on.
+            x0 (int): x of the graph's top-left corner on that surface.
+            y0 (int): y of the graph's top-left corner on that surface.
+
         Returns:
             None
         """
@@ -388,27 +674,26 @@ class Graph(UIElement, Observer, Observable):
                 None
             """
 
-            text_surf = font.render(text, True, color).convert_alpha()
-            text_surf.fill((255, 255, 255, alpha), None, pygame.BLEND_RGBA_MULT)
-            surface.blit(text_surf, position)
+            surface.blit(text_cache.render(font, text, color, alpha=alpha), position)
 
 
 
         alpha_value = 128
-        pygame.draw.rect(screen, (0, 0, 0), (self.x, self.y, self.width, self.height), 2)
+        pygame.draw.rect(surface, (0, 0, 0), (x0, y0, self.width, self.height), 2)
 
 
         if self.df is not None:
             start_idx, end_idx = self.display_range
             displayed_data = self.df.iloc[start_idx:end_idx + 1]
 
-            max_val = displayed_data[self.column].max()
-            min_val = displayed_data[self.column].min()
+            min_val, max_val = self.day.value_range(self.column, start_idx, end_idx + 1)
+            self._scale = (min_val, max_val)  # For the highlight point, drawn every frame.
             denominator = max_val - min_val
+            values = displayed_data[self.column].to_numpy(dtype=np.float64)
             if max_val == min_val:
-                values_normalized = [0.5 for _ in displayed_data[self.column]]  # Middle of the graph
+                values_normalized = np.full(len(values), 0.5)  # Middle of the graph
             else:
-                values_normalized = [(value - min_val) / (max_val - min_val) for value in displayed_data[self.column]]
+                values_normalized = (values - min_val) / (max_val - min_val)
 
             # Y-axis value rendering
             if max_val == min_val:
@@ -417,215 +702,152 @@ class Graph(UIElement, Observer, Observable):
                 mid_val = (max_val + min_val) / 2
 
             if self.bar_chart == 0:
-                ohlc_data = displayed_data.resample('5T').agg({
-                    self.column: ['first', 'max', 'min', 'last']
-                })
-                ohlc_data.columns = ['Open', 'High', 'Low', 'Close']
-                ohlc_data.dropna(inplace=True)
+                # Sliced from the day's cached bar pyramid; only the edge bars are recomputed.
+                ohlc_data = self.day.ohlc_range(self.column, start_idx, end_idx + 1,
+                                                self.current_bar_rule(start_idx, end_idx))
 
                 candle_width = max(1, self.width / len(ohlc_data) - 2)
 
-                for idx, (timestamp, row) in enumerate(ohlc_data.iterrows()):
-                    x_pos = self.x + (self.width / (len(ohlc_data) - 1) * idx)
-                    y_open = self.y + self.height - (self.height * (row['Open'] - min_val) / (max_val - min_val))
-                    y_high = self.y + self.height - (self.height * (row['High'] - min_val) / (max_val - min_val))
-                    y_low = self.y + self.height - (self.height * (row['Low'] - min_val) / (max_val - min_val))
-                    y_close = self.y + self.height - (self.height * (row['Close'] - min_val) / (max_val - min_val))
-
-                    if self.prof_coloring:
-                        lookback_period = 5
-                        # Ensure you don't get an index out of range and then check the logic.
-                        if idx - lookback_period >= 0 and ohlc_data['Close'].iloc[idx] > ohlc_data['Close'].iloc[
-                            idx - lookback_period]:
-                            current_color = (0, 255, 0)  # green for up
+                # Coordinates of every candle at once.
+                opens, highs, lows, closes = (ohlc_data[key].to_numpy() for key in ('Open', 'High', 'Low', 'Close'))
+                x_positions = x0 + (self.width / max(len(ohlc_data) - 1, 1) * np.arange(len(ohlc_data)))
+                y_opens, y_highs, y_lows, y_closes = (
+                    (y0 + self.height - (self.height * (prices - min_val) / (max_val - min_val))).tolist()
+                    for prices in (opens, highs, lows, closes))
+                x_positions = x_positions.tolist()
+
+                for current_color, indices in self._bar_color_groups(closes):
+                    for idx in indices.tolist():
+                        x_pos, y_open, y_close = x_positions[idx], y_opens[idx], y_closes[idx]
+
+                        # Draw the wick from Low to High
+                        pygame.draw.line(surface, current_color, (int(x_pos), int(y_lows[idx])),
+                                         (int(x_pos), int(y_highs[idx])), 1)
+
+                        # Draw the body of the candlestick
+                        if closes[idx] >= opens[idx]:
+                            pygame.draw.rect(surface, current_color, (
+                                int(x_pos - candle_width / 2), int(y_open), candle_width, int(y_close - y_open)))
                         else:
-                            current_color = (255, 0, 0)  # red for down
-                    else:
-                        current_color = self.color
-
-                    # Draw the wick from Low to High
-                    pygame.draw.line(screen, current_color, (int(x_pos), int(y_low)), (int(x_pos), int(y_high)), 1)
-
-                    # Draw the body of the candlestick
-                    if row['Close'] >= row['Open']:
-                        pygame.draw.rect(screen, current_color, (
-                            int(x_pos - candle_width / 2), int(y_open), candle_width, int(y_close - y_open)))
-                    else:
-                        pygame.draw.rect(screen, current_color, (
-                            int(x_pos - candle_width / 2), int(y_close), candle_width, int(y_open - y_close)))
+                            pygame.draw.rect(surface, current_color, (
+                                int(x_pos - candle_width / 2), int(y_close), candle_width, int(y_open - y_close)))
 
 
             # Define y positions for text
-            y_pos_max = self.y + 5  # 5 pixels from the top edge of the graph
-            y_pos_mid = self.y + self.height / 2 - 12  # centered in the middle, adjusted for text height
-            y_pos_min = self.y + self.height - 25  # 25 pixels from the bottom edge to account for text height
+            y_pos_max = y0 + 5  # 5 pixels from the top edge of the graph
+            y_pos_mid = y0 + self.height / 2 - 12  # centered in the middle, adjusted for text height
+            y_pos_min = y0 + self.height - 25  # 25 pixels from the bottom edge to account for text height
 
             # Render the text
-            text_max = self.font.render(f"{max_val:.2f}", True, self.label_color)
-            text_mid = self.font.render(f"{mid_val:.2f}", True, self.label_color)
-            text_min = self.font.render(f"{min_val:.2f}", True, self.label_color)
+            text_max = text_cache.render(self.font, f"{max_val:.2f}", self.label_color)
+            text_mid = text_cache.render(self.font, f"{mid_val:.2f}", self.label_color)
+            text_min = text_cache.render(self.font, f"{min_val:.2f}", self.label_color)
 
             padding = 10  # distance from the right edge of the graph
-            x_pos_text = self.x + self.width + padding
+            x_pos_text = x0 + self.width + padding
 
             # Blit the text
-            screen.blit(text_max, (x_pos_text, y_pos_max))
-            screen.blit(text_mid, (x_pos_text, y_pos_mid))
-            screen.blit(text_min, (x_pos_text, y_pos_min))
-
-            # Extract time values from the DateTime column
-            time_values = displayed_data.index.strftime('%H:%M').tolist()
+            surface.blit(text_max, (x_pos_text, y_pos_max))
+            surface.blit(text_mid, (x_pos_text, y_pos_mid))
+            surface.blit(text_min, (x_pos_text, y_pos_min))
 
             # Determine the number of time labels to display based on size_multiplier
             num_intervals = int(self.size_multiplier * 7)  # Multiplying by 7 as a baseline number of intervals
             num_intervals = max(3, min(num_intervals, 7))  # Ensure between 3 and 7 labels are shown
 
-            interval_step = max(len(time_values) // num_intervals, 1)  # Ensure it's at least 1
+            interval_step = max(len(displayed_data) // num_intervals, 1)  # Ensure it's at least 1
 
-            # Displaying time values on the X-axis at the determined intervals
-            for idx in range(0, len(time_values), interval_step):
-                x_pos = self.x + (self.width / (len(displayed_data) - 1) * idx)
-                time_text = self.font.render(time_values[idx], True, self.label_color)
-                render_transparent_text(screen, time_values[idx], self.font, self.label_color,
-                                        (x_pos - time_text.get_width() / 2, self.y + self.height + 5), alpha_value)
+            # Displaying time values on the X-axis at the determined intervals; only these rows are formatted.
+            for idx in range(0, len(displayed_data), interval_step):
+                x_pos = x0 + (self.width / (len(displayed_data) - 1) * idx)
+                time_value = self.day.meta.time_label(start_idx + idx)
+                time_width = self.font.size(time_value)[0]
+                render_transparent_text(surface, time_value, self.font, self.label_color,
+                                        (x_pos - time_width / 2, y0 + self.height + 5), alpha_value)
 
-            prev_x_pos = None
-            prev_y_pos = None
 
             if self.bar_chart == 1:
-                ohlc_data = displayed_data.resample('5T').agg({self.column: ['first', 'max', 'min', 'last']})
-                ohlc_data.columns = ['Open', 'High', 'Low', 'Close']
-                ohlc_data.dropna(inplace=True)
+                ohlc_data = self.day.ohlc_range(self.column, start_idx, end_idx + 1,
+                                                self.current_bar_rule(start_idx, end_idx))
 
                 bar_width = max(1, self.width / len(ohlc_data) - 2)
-                width_ratio = self.width / (len(ohlc_data) - 1)
+                width_ratio = self.width / max(len(ohlc_data) - 1, 1)
 
                 transparency = 128  # Adjust as needed. 0 is fully transparent, 255 is opaque.
 
-                for idx, (_, row) in enumerate(ohlc_data.iterrows()):
-                    x_pos = self.x + width_ratio * idx
-                    y_values = [
-                        self.y + self.height - (self.height * (row[key] - min_val) / denominator)
-                        for key in ['Open', 'High', 'Low', 'Close']
-                    ]
-
-                    if self.prof_coloring:
-                        lookback_period = 5  # Adjust as needed.
+                # Coordinates of every bar at once.
+                opens, highs, lows, closes = (ohlc_data[key].to_numpy() for key in ('Open', 'High', 'Low', 'Close'))
+                x_positions = (x0 + width_ratio * np.arange(len(ohlc_data))).tolist()
+                y_opens, y_highs, y_lows, y_closes = (
+                    (y0 + self.height - (self.height * (prices - min_val) / denominator)).tolist()
+                    for prices in (opens, highs, lows, closes))
+
+                for current_color, indices in self._bar_color_groups(closes):
+                    bodies = {}  # Transparent body surfaces of this color, by height.
+                    for idx in indices.tolist():
+                        x_pos, y_open, y_close = x_positions[idx], y_opens[idx], y_closes[idx]
+
+                        # Draw vertical line from Low to High
+                        pygame.draw.line(surface, current_color, (int(x_pos), int(y_lows[idx])),
+                                         (int(x_pos), int(y_highs[idx])), 1)
+
+                        # Drawing a transparent rectangle for the Open and Close prices
+                        # Per-pixel alpha, so the rectangle blends the same on the transparent layer as on the screen.
+                        body_size = (int(bar_width), int(abs(y_open - y_close)))
+                        body = bodies.get(body_size)
+                        if body is None:
+                            body = bodies[body_size] = pygame.Surface(body_size, pygame.SRCALPHA)
+                            body.fill(current_color + (transparency,))
+
+                        # Adjust positioning based on the Open and Close values
+                        rect_y = min(y_open, y_close)
+                        surface.blit(body, (int(x_pos - bar_width / 2), int(rect_y)))
+            if self.bar_chart == 2 and len(values) > 1:
+                # Only the points that shape the line at this width; all of them for short ranges.
+                indices = self.decimated_indices(values, start_idx, end_idx)
+
+                # Pixel coordinates of every point at once.
+                x_positions = (x0 + self.width / (len(values) - 1) * indices).astype(int)
+                y_positions = (y0 + self.height - self.height * values_normalized[indices]).astype(int)
+                points = np.column_stack((x_positions, y_positions)).tolist()
+
+                if self.prof_coloring:
+                    # A segment is green when its end point rose over the lookback, red otherwise.
+                    rising = window_profit_mask(self.day.rising(self.column, 1),
+                                                self.day.rising(self.column, self.lookback_period),
+                                                start_idx, end_idx + 1, self.lookback_period)[indices]
+                    changes = np.flatnonzero(rising[2:] != rising[1:-1]) + 2
+                    for first, last in zip(np.r_[1, changes], np.r_[changes, len(indices)]):
+                        current_color = (0, 255, 0) if rising[first] else (255, 0, 0)
+                        # One call per same-coloured run, from the point before it to its last point.
+                        pygame.draw.lines(surface, current_color, False, points[first - 1:last], 2)
+                else:
+                    pygame.draw.lines(surface, self.color, False, points, 2)
 
-                        # Ensure you don't get an index out of range and then check the logic.
-                        if idx - lookback_period >= 0 and ohlc_data['Close'].iloc[idx] > ohlc_data['Close'].iloc[
-                            idx - lookback_period]:
-                            current_color = (0, 255, 0)  # green for up
-                        else:
-                            current_color = (255, 0, 0)  # red for down
-                    else:
-                        current_color = self.color
-
-                    # Draw vertical line from Low to High
-                    pygame.draw.line(screen, current_color, (int(x_pos), int(y_values[2])),
-                                     (int(x_pos), int(y_values[1])), 1)
-
-                    # Drawing a transparent rectangle for the Open and Close prices
-                    temp_surface = pygame.Surface((bar_width, abs(y_values[0] - y_values[3])))
-                    temp_surface.fill(current_color)
-                    temp_surface.set_alpha(transparency)
-
-                    # Adjust positioning based on the Open and Close values
-                    rect_y = min(y_values[0], y_values[3])
-                    screen.blit(temp_surface, (int(x_pos - bar_width / 2), int(rect_y)))
-            if self.bar_chart == 2:
-                for idx, value in enumerate(values_normalized):
-                    relative_idx = idx
-
-                    x_pos = self.x + (self.width / (len(displayed_data) - 1) * relative_idx) if len(
-                        displayed_data) > 1 else self.x
-
-                    y_pos = self.y + self.height - (self.height * value)
-                    current_color = self.color  # default color
-
-                    # If profit_coloring is active, decide the color based on value change
-                    if self.prof_coloring:
-                        lookback_period = 5  # or whatever value you deem appropriate
-                        if idx >= lookback_period:
-                            if displayed_data[self.column].iloc[idx] > displayed_data[self.column].iloc[
-                                idx - lookback_period]:
-                                current_color = (0, 255, 0)  # green for up
-                            else:
-                                current_color = (255, 0, 0)  # red for down
-                        else:
-                            if idx > 0:
-                                if displayed_data[self.column].iloc[idx] > displayed_data[self.column].iloc[
-                                    idx - 1]:
-                                    current_color = (0, 255, 0)  # green for up
-                                else:
-                                    current_color = (255, 0, 0)  # red for down
-                            else:
-                                current_color = (0, 255, 0)
-                    else:
-                        current_color = self.color
-
-                    if prev_x_pos is not None:
-                        pygame.draw.line(screen, current_color, (int(prev_x_pos), int(prev_y_pos)),
-                                         (int(x_pos), int(y_pos)), 2)
-
-                    prev_x_pos = x_pos
-                    prev_y_pos = y_pos
-
-            # Display a point for the highlighted index
-            if self.highlight_index is not None and 0 <= self.highlight_index < len(self.df):
-                relative_idx = self.highlight_index - start_idx
-                x_pos = self.x + (self.width / (len(displayed_data) - 1) * relative_idx) if len(
-                    displayed_data) > 1 else self.x
-
-                value = self.df[self.column].iloc[self.highlight_index]
-                value_normalized = (value - min_val) / (max_val - min_val)
-                y_pos = self.y + self.height - (self.height * value_normalized)
-                pygame.draw.circle(screen, (255, 255, 255), (int(x_pos), int(y_pos)), self.point_radius * 1.2)
-
-        self.rect = pygame.Rect(self.x - 5, self.y - 5, self.width + 10, self.height + 10)
 
         # Display the original title for the graph
-        title_surf = self.font.render(self.original_title, True, self.color)
-        screen.blit(title_surf, (self.x, self.y - 30))
-
-        strategy = Strategy()  # Initialize your strategy instance
+        title_surf = text_cache.render(self.font, self.original_title, self.color)
+        surface.blit(title_surf, (x0, y0 - 30))
 
         if self.strategy and self.strategy_active and self.strategy_name in self.df.columns:
-            for idx, (value, signal) in enumerate(zip(values_normalized, displayed_data[self.strategy_name])):
-                x_pos = self.x + (self.width / (len(displayed_data) - 1) * idx) if len(displayed_data) > 1 else self.x
-                y_pos = self.y + self.height - (self.height * value)
-
-                color, label = strategy.get_signal_display_info(signal)
-
-                if color is not None:
-                    pygame.draw.circle(screen, color, (int(x_pos), int(y_pos)), self.point_radius)
-
+            # Only the rows that carry a signal, found by binary search in the day's signal index.
+            signal_index = self.day.signal_index(self.strategy_name)
+            markers = []  # (x, y, label, color) of the labelled signals
+            for row, color, label in signal_index.events(start_idx, end_idx + 1, self.strategy):
+                idx = row - start_idx
+                x_pos = x0 + (self.width / (len(displayed_data) - 1) * idx) if len(displayed_data) > 1 else x0
+                y_pos = y0 + self.height - (self.height * values_normalized[idx])
+
+                pygame.draw.circle(surface, color, (int(x_pos), int(y_pos)), self.point_radius)
                 if label:
-                    label_surface = self.font.render(label, True, color)
-                    label_width = label_surface.get_width()
-                    label_height = label_surface.get_height()
-
-                    # Check space above and below the point
-                    space_above = y_pos - self.y
-                    space_below = (self.y + self.height) - y_pos
-
-                    # Prefer vertical positioning with added logic for up vs down
-                    if space_above > label_height and (
-                            self.height / 2) > y_pos:  # if point is in the upper half of the graph
-                        text_pos = (int(x_pos - label_width / 2), int(y_pos) - 20 - label_height)
-                    elif space_below > label_height and (
-                            self.height / 2) <= y_pos:  # if point is in the lower half of the graph
-                        text_pos = (int(x_pos - label_width / 2), int(y_pos) + 20)
-                    else:  # Adjust based on space available
-                        if space_above > space_below:
-                            text_pos = (int(x_pos - label_width / 2), int(y_pos) - 20 - label_height)
-                        else:
-                            text_pos = (int(x_pos - label_width / 2), int(y_pos) + 20)
+                    markers.append((x_pos, y_pos, label, color))
 
-                    screen.blit(label_surface, text_pos)
+            # Labels are placed together, so crowded signals merge into counts instead of piling up.
+            for text, color, text_pos in self.signal_label_layout(markers, y0):
+                surface.blit(text_cache.render(self.font, text, color), text_pos)
 
         if self.grid:
-            screen.blit(self.grid_surface, (self.x, self.y))
+            surface.blit(self.grid_surface, (x0, y0))
 
 
     def compute_moving_average(self, window_size=3):
@@ -655,26 +877,59 @@ class Graph(UIElement, Observer, Observable):
         if not self.data_filename:  # If filename not set, don't continue
             return
 
+        new_path = self.day_path(day)
         try:
-            new_path = f"./data/{self.strategy_dir}/Day{day}.csv"
-            new_df = pd.read_csv(new_path)
-            self.df_path = new_path
-            if not new_df.empty:
-                self.df_path = new_path
-                self.df = new_df
-                self.df['DateTime'] = pd.to_datetime(self.df['DateTime'], format='%m/%d/%Y %H:%M')
-                self.df.set_index('DateTime', inplace=True)
-                self.ohlc_data = self.df.resample('5T').agg({
-                    'Price': ['first', 'max', 'min', 'last']
-                })
-
-                self.ohlc_data.columns = ['Open', 'High', 'Low', 'Close']
-                self.ohlc_data.dropna(inplace=True)  # drop any empty intervals
-
-            else:
-                print(f"Warning: Data file {new_path} is empty.")
+            new_day = day_store.acquire(new_path, self.data_columns())
         except FileNotFoundError:
             print(f"Error: Data file {new_path} not found.")
+            return
+        self.swap_day(new_day, new_path)
+
+    def day_path(self, day):
+        """
+        Return the path of the data file for the specified day.
+
+        Args:
+            day (int): The day value.
+
+        Returns:
+            str: The path of the day's CSV in the graph's strategy directory.
+        """
+        return f"./data/{self.strategy_dir}/Day{day}.csv"
+
+    def swap_day(self, new_day, new_path):
+        """
+        Switch the graph to an already acquired day, taking over the caller's reference to it.
+
+        Args:
+            new_day (DayData): The acquired day data. None (e.g. a missing file) keeps the current day.
+            new_path (str): The path the day was acquired from.
+
+        Returns:
+            None
+        """
+        if new_day is None:
+            return
+
+        self.df_path = new_path
+        if not new_day.df.empty:
+            new_day.ensure_columns(self.data_columns())  # The loader may have read a narrower projection.
+            day_store.release(self.day)
+            self.day = new_day
+            self.ohlc_data = new_day.ohlc('Price', '5T')
+        else:
+            day_store.release(new_day)
+            print(f"Warning: Data file {new_path} is empty.")
+
+    def release_data(self):
+        """
+        Hand the graph's day data back to the shared store. Call this when the graph is discarded.
+
+        Returns:
+            None
+        """
+        day_store.release(self.day)
+        self.day = None
 
     def update_position(self, dx, dy, other_graphs=[]):
         """
@@ -692,6 +947,7 @@ class Graph(UIElement, Observer, Observable):
         self.toggle_button_chart.update_position(dx, dy)
         self.toggle_button_color.update_position(dx, dy)
         self.toggle_button_strategy.update_position(dx, dy)
+        self.toggle_button_timeframe.update_position(dx, dy)
 
 
     def update(self, value):
@@ -780,6 +1036,8 @@ class Graph(UIElement, Observer, Observable):
             'strategy_active': self.strategy_active,
             'is_grid': self.grid,
             'is_bar': self.bar_chart,
+            'bar_rule': self.bar_rule,
+            'lookback_period': self.lookback_period,
             'is_prof': self.prof_coloring
         })
         return data
@@ -814,10 +1072,61 @@ class Graph(UIElement, Observer, Observable):
             grid=data['is_grid'],
             prof_coloring=data['is_prof'],
             bar_chart=data['is_bar'],
+            bar_rule=data.get('bar_rule'),
+            lookback_period=data.get('lookback_period', DEFAULT_LOOKBACK),
             font=pygame.font.SysFont('arial', 14)
         )
 
 
+class HighlightMarker:
+    """
+    The highlight point of a graph as a UI element of its own, so that a moving highlight only
+    repaints the pixels around the point rather than the whole graph.
+
+    Methods:
+        display(screen): Draw the point.
+        render_state(): Return the point's position.
+        dirty_rect(): Return the area the point covers.
+    """
+
+    def __init__(self, graph):
+        """
+        Initialize a HighlightMarker.
+
+        Args:
+            graph (Graph): The graph whose highlight point this is.
+        """
+        self.graph = graph
+
+    def display(self, screen):
+        """
+        Draw the point on the given screen.
+
+        Args:
+            screen (pygame.Surface): The Pygame surface to draw on.
+        """
+        self.graph.draw_highlight(screen)
+
+    def render_state(self):
+        """
+        Return the point's position, None when there is nothing to highlight.
+        """
+        return self.graph._highlight_position()
+
+    def dirty_rect(self):
+        """
+        Return the area the point covers, empty when there is nothing to highlight.
+
+        Returns:
+            pygame.Rect: The bounding rectangle of the point.
+        """
+        position = self.graph._highlight_position()
+        if position is None:
+            return pygame.Rect(0, 0, 0, 0)
+        radius = int(self.graph.point_radius * 1.2) + 1
+        return pygame.Rect(position[0] - radius, position[1] - radius, 2 * radius + 1, 2 * radius + 1)
+
+
 
 
 def main():
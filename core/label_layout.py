@@ -0,0 +1,161 @@
+import pygame
+
+
+class SpatialHash:
+    """
+    A uniform grid over the plane for finding rectangles near a given one.
+
+    Every rectangle is stored in each grid cell it touches, so a query only looks at the
+    rectangles in the cells the query touches instead of at all of them.
+
+    Methods:
+        insert(rect, item): Store an item under a rectangle.
+        query(rect): Return the items stored in the cells a rectangle touches.
+    """
+
+    def __init__(self, cell_size=64):
+        """
+        Initialize a SpatialHash.
+
+        Args:
+            cell_size (int, optional): The width and height of a grid cell in pixels. Default is 64.
+        """
+        self.cell_size = cell_size
+        self._cells = {}
+
+    def _keys(self, rect):
+        """
+        Return the grid cells a rectangle touches.
+        """
+        size = self.cell_size
+        return [(column, row)
+                for column in range(rect.left // size, (rect.right - 1) // size + 1)
+                for row in range(rect.top // size, (rect.bottom - 1) // size + 1)]
+
+    def insert(self, rect, item):
+        """
+        Store an item under a rectangle.
+
+        Args:
+            rect (pygame.Rect): The area the item covers.
+            item: The item.
+        """
+        for key in self._keys(rect):
+            self._cells.setdefault(key, []).append(item)
+
+    def query(self, rect):
+        """
+        Return the items stored in the cells a rectangle touches. They are only candidates: an item
+        may share a cell with the rectangle without overlapping it.
+
+        Args:
+            rect (pygame.Rect): The area to look around.
+
+        Returns:
+            list: The distinct items, in the order they were stored.
+        """
+        found = {}
+        for key in self._keys(rect):
+            for item in self._cells.get(key, ()):
+                found[id(item)] = item
+        return list(found.values())
+
+
+class _LabelGroup:
+    """
+    One placed label, standing for one or more signals whose labels would overlap.
+    """
+
+    def __init__(self, text, color, rect):
+        self.texts = [text]
+        self.color = color
+        self.rect = rect
+
+    @property
+    def text(self):
+        """
+        str: The label, with the number of merged signals: "Buy x3", or "Buy +2" when they differ.
+        """
+        if len(self.texts) == 1:
+            return self.texts[0]
+        if len(set(self.texts)) == 1:
+            return f"{self.texts[0]} x{len(self.texts)}"
+        return f"{self.texts[0]} +{len(self.texts) - 1}"
+
+
+def label_positions(x_pos, y_pos, label_width, label_height, top, height, gap=20):
+    """
+    Return the two places a signal label can go, the preferred one first: above the point in the
+    upper half of the graph, below it in the lower half, or on the side with more room when the
+    preferred side is too tight.
+
+    Args:
+        x_pos (float): x of the signal point.
+        y_pos (float): y of the signal point.
+        label_width (int): Width of the label.
+        label_height (int): Height of the label.
+        top (int): y of the graph's top edge.
+        height (int): Height of the graph.
+        gap (int, optional): Distance between the point and the label. Default is 20.
+
+    Returns:
+        list[tuple]: The top-left corners of the preferred and the other position.
+    """
+    above = (int(x_pos - label_width / 2), int(y_pos) - gap - label_height)
+    below = (int(x_pos - label_width / 2), int(y_pos) + gap)
+    space_above = y_pos - top
+    space_below = (top + height) - y_pos
+
+    if space_above > label_height and (top + height / 2) > y_pos:  # if point is in the upper half of the graph
+        return [above, below]
+    if space_below > label_height and (top + height / 2) <= y_pos:  # if point is in the lower half of the graph
+        return [below, above]
+    return [above, below] if space_above > space_below else [below, above]
+
+
+def layout_labels(markers, font, top, height, cell_size=64):
+    """
+    Place the labels of signal points so they do not overlap.
+
+    Each label goes to its preferred position, or the other side of its point if that is taken.
+    A label that overlaps placed labels in both positions is merged into the label it overlaps,
+    which then shows a count. Overlaps are found through a SpatialHash, so the pass stays close to
+    linear in the number of labels.
+
+    Args:
+        markers (list[tuple]): (x, y, text, color) of every labelled signal point, in drawing order.
+        font (pygame.font.Font): The font the labels are drawn with.
+        top (int): y of the graph's top edge.
+        height (int): Height of the graph.
+        cell_size (int, optional): The spatial hash cell size in pixels. Default is 64.
+
+    Returns:
+        list[tuple]: (text, color, top-left corner) of every label to draw.
+    """
+    grid = SpatialHash(cell_size)
+    groups = []
+
+    def overlapping(rect):
+        return [group for group in grid.query(rect) if group.rect.colliderect(rect)]
+
+    for x_pos, y_pos, text, color in markers:
+        label_width, label_height = font.size(text)
+        positions = label_positions(x_pos, y_pos, label_width, label_height, top, height)
+        for position in positions:
+            rect = pygame.Rect(position, (label_width, label_height))
+            if not overlapping(rect):
+                group = _LabelGroup(text, color, rect)
+                groups.append(group)
+                grid.insert(rect, group)
+                break
+        else:
+            # Both sides are taken: count this signal in the label at the preferred position.
+            group = overlapping(pygame.Rect(positions[0], (label_width, label_height)))[0]
+            group.texts.append(text)
+            # The wider label stays centred where the group's label was.
+            center_x = group.rect.centerx
+            group.rect = pygame.Rect((0, group.rect.top), font.size(group.text))
+            group.rect.centerx = center_x
+            grid.insert(group.rect, group)
+
+    return [(group.text, group.color, group.rect.topleft) for group in groups]
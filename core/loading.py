@@ -0,0 +1,160 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from core.day_store import day_store
+
+
+class DayLoader:
+    """
+    Loads days on a worker thread so the render loop never blocks on reading or preparing data.
+
+    A load acquires one DayData per requested path. When it finishes, poll() (called from the
+    render loop) hands the days to the load's callback on the main thread, so every graph can be
+    swapped to the new day in the same frame. Loads go into named slots ('day' for day changes,
+    'preset' for preset loading), each with its own worker, so a day change never drops a pending
+    preset load or the other way round. Within a slot only the latest load matters: submitting a
+    new one supersedes the pending one, whose days are released as soon as it finishes.
+
+    Methods:
+        submit(paths, on_ready, columns, slot): Start loading days, replacing the slot's pending load.
+        poll(): Deliver finished loads to their callbacks. Returns True if one was delivered.
+        cancel(slot): Drop the pending load of a slot, or of every slot.
+        is_pending(slot): True while the slot has a pending load.
+        is_loading: True while any load is pending.
+        progress: Fraction of the pending loads read so far.
+    """
+
+    SLOTS = ('day', 'preset')
+
+    def __init__(self, store=day_store):
+        """
+        Initialize a DayLoader.
+
+        Args:
+            store (DayStore, optional): The store days are acquired from. Default is the shared store.
+        """
+        self.store = store
+        # One worker per slot, so loads of different slots run side by side.
+        self._executor = ThreadPoolExecutor(max_workers=len(self.SLOTS), thread_name_prefix='day-loader')
+        self._pending = {}  # slot -> (future, on_ready)
+        self._generations = dict.fromkeys(self.SLOTS, 0)  # Submitted loads per slot; stale loads cannot report progress.
+        self._progress = dict.fromkeys(self.SLOTS, 0.0)
+
+    def is_pending(self, slot):
+        """
+        Return whether a slot has a pending load.
+
+        Args:
+            slot (str): 'day' or 'preset'.
+
+        Returns:
+            bool: True while the slot's load is pending.
+        """
+        return slot in self._pending
+
+    @property
+    def is_loading(self):
+        """
+        bool: True while any load is pending.
+        """
+        return bool(self._pending)
+
+    @property
+    def progress(self):
+        """
+        float: Fraction (0 to 1) of the pending loads read so far. Days that are already cached count as read.
+        """
+        if not self._pending:
+            return 0.0
+        return sum(self._progress[slot] for slot in self._pending) / len(self._pending)
+
+    def submit(self, paths, on_ready, columns=None, slot='day'):
+        """
+        Start acquiring the days of the given paths on the worker thread.
+
+        Args:
+            paths (list[str]): The day CSV paths to acquire, one per consumer (duplicates are fine).
+            on_ready (callable): Called on the main thread with the list of acquired DayData, in the
+                                 order of paths. Paths that could not be read give None.
+            columns (list[str], optional): The columns to read. Default is every column.
+            slot (str, optional): 'day' or 'preset'. Only the slot's own pending load is replaced.
+                                  Default is 'day'.
+        """
+        self.cancel(slot)
+        self._generations[slot] += 1
+        self._progress[slot] = 0.0
+        future = self._executor.submit(self._acquire_all, list(paths), columns, slot,
+                                       self._generations[slot])
+        self._pending[slot] = (future, on_ready)
+
+    def poll(self):
+        """
+        Hand finished loads to their callbacks. Call this once per frame from the render loop.
+
+        Returns:
+            bool: True if a load was delivered this call.
+        """
+        delivered = False
+        for slot, pending in list(self._pending.items()):
+            # A callback may cancel or replace another slot's load (e.g. a preset drops a day change).
+            if self._pending.get(slot) is not pending or not pending[0].done():
+                continue
+
+            future, on_ready = self._pending.pop(slot)
+            try:
+                days = future.result()
+            except Exception as e:
+                print(f"Error: Loading days failed ({e}).")
+                continue
+            on_ready(days)
+            delivered = True
+        return delivered
+
+    def cancel(self, slot=None):
+        """
+        Drop the pending load of a slot. Its days are released once the worker finishes reading them.
+
+        Args:
+            slot (str, optional): 'day' or 'preset'. Default is None (every slot).
+        """
+        for slot in ([slot] if slot is not None else list(self._pending)):
+            pending = self._pending.pop(slot, None)
+            if pending is not None:
+                # A load that has not started yet never takes a worker; a running one is released when done.
+                pending[0].cancel()
+                pending[0].add_done_callback(self._release_result)
+
+    def _acquire_all(self, paths, columns, slot, generation):
+        """
+        Acquire the day of every path. Runs on a worker thread.
+        """
+        def report(done):
+            if generation == self._generations[slot]:
+                self._progress[slot] = done / len(paths)
+
+        days = []
+        try:
+            for i, path in enumerate(paths):
+                try:
+                    days.append(self.store.acquire(path, columns, lambda fraction: report(i + fraction)))
+                except FileNotFoundError:
+                    print(f"Error: Data file {path} not found.")
+                    days.append(None)
+                report(i + 1)
+        except BaseException:
+            for day in days:
+                self.store.release(day)
+            raise
+        return days
+
+    def _release_result(self, future):
+        """
+        Release the days of a superseded load.
+        """
+        if future.cancelled() or future.exception() is not None:
+            return
+        for day in future.result():
+            self.store.release(day)
+
+
+# The loader shared by the day switch and preset loading.
+day_loader = DayLoader()
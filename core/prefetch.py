@@ -0,0 +1,120 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import zip_longest
+
+from core.day_manifest import get_manifest
+from core.day_store import day_store
+from utils.observering import Observer
+
+
+class DayPrefetcher(Observer):
+    """
+    Reads and prepares the days around the current one on background threads.
+
+    The prefetcher observes a DaySwitch; whenever the current day changes it schedules days
+    N-radius..N+radius (nearest first) to be preloaded into the shared day store, so clicking an
+    arrow usually swaps in a day that is already prepared.
+
+    Attributes:
+        strategy_dir (str): Name of the strategy directory under ./data.
+        radius (int): How many days on each side of the current day to prefetch.
+        store (DayStore): The store days are preloaded into.
+        columns (list[str] or None): The columns to read, None for every column.
+
+    Methods:
+        update(value): Schedule the neighbours of a new current day.
+        stats(): Return the store's prefetch hit/miss counters.
+        shutdown(): Stop the worker threads.
+    """
+
+    def __init__(self, strategy_dir, radius=2, max_workers=2, store=day_store, columns=None):
+        """
+        Initialize a DayPrefetcher.
+
+        Args:
+            strategy_dir (str): Name of the strategy directory under ./data.
+            radius (int, optional): Days to prefetch on each side of the current day. Default is 2.
+            max_workers (int, optional): Number of worker threads. Default is 2.
+            store (DayStore, optional): The store to preload into. Default is the shared store.
+            columns (list[str], optional): The columns to read. Default is every column.
+        """
+        self.strategy_dir = strategy_dir
+        self.radius = radius
+        self.store = store
+        self.columns = columns
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='day-prefetch')
+        self._futures = {}  # path -> Future of a scheduled preload
+
+        # Keep the whole window cached next to the day that was just switched away from.
+        self.store.keep_idle(self, 2 * radius + 1)
+
+    def update(self, value):
+        """
+        Schedule the days around a new current day, cancelling the preloads of an earlier window
+        that have not started and fall outside the new one.
+
+        Args:
+            value (int): The new current day number.
+        """
+        manifest = get_manifest(os.path.join('.', 'data', self.strategy_dir))
+        forward = self._walk(manifest, value, 1)
+        backward = self._walk(manifest, value, -1)
+
+        # Nearest first: N+1, N-1, N+2, N-2, ...
+        ordered = []
+        for pair in zip_longest(forward, backward):
+            for day in pair:
+                if day is not None and day != value and day not in ordered:
+                    ordered.append(day)
+
+        paths = [f"./data/{self.strategy_dir}/Day{day}.csv" for day in ordered]
+        for path, future in list(self._futures.items()):
+            if path not in paths:
+                future.cancel()  # Only preloads still waiting for a worker can be cancelled.
+            if path not in paths or future.done():
+                del self._futures[path]
+
+        for path in paths:
+            if path not in self._futures and not self.store.contains(path):
+                self._futures[path] = self._executor.submit(self._preload, path, self.columns)
+
+    def _walk(self, manifest, day, direction):
+        """
+        Return up to radius available days stepping from day in one direction.
+        """
+        days = []
+        for _ in range(self.radius):
+            day = manifest.next_day(day, direction)
+            if day is None:
+                break
+            days.append(day)
+        return days
+
+    def _preload(self, path, columns):
+        """
+        Preload one day, ignoring days that disappeared or cannot be read.
+        """
+        try:
+            self.store.preload(path, columns)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Could not prefetch {path} ({e}).")
+
+    def stats(self):
+        """
+        Return the prefetch counters of the store.
+
+        Returns:
+            dict: 'hits' (days found already prepared), 'misses' (days read on demand) and 'hit_rate'.
+        """
+        hits, misses = self.store.prefetch_hits, self.store.misses
+        total = hits + misses
+        return {'hits': hits, 'misses': misses, 'hit_rate': hits / total if total else 0.0}
+
+    def shutdown(self):
+        """
+        Stop the worker threads, dropping prefetches that have not started, and withdraw the
+        prefetch window from the store.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._futures.clear()
+        self.store.keep_idle(self, 0)
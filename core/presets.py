@@ -101,6 +101,39 @@ def load_preset(filename='presets/preset.json', font=None):
 
     return projections
 
+def preset_data_files(filename='presets/preset.json'):
+    """
+    List the data files the graphs of a preset will load.
+
+    Args:
+        filename (str, optional): The name of the JSON file to read. Default is 'presets/preset.json'.
+
+    Returns:
+        list: The existing data file paths, one per graph (graphs with missing files are skipped by load_preset too).
+    """
+    with open(filename, 'r') as f:
+        data = json.load(f)
+
+    return [proj_data['data_file'] for proj_data in data
+            if proj_data['type'] == 'Graph' and os.path.exists(proj_data['data_file'])]
+
+def preset_data_columns(filename='presets/preset.json'):
+    """
+    List the data columns the graphs of a preset will read.
+
+    Args:
+        filename (str, optional): The name of the JSON file to read. Default is 'presets/preset.json'.
+
+    Returns:
+        list: The union of the graphs' columns.
+    """
+    with open(filename, 'r') as f:
+        data = json.load(f)
+
+    columns = [column for proj_data in data if proj_data['type'] == 'Graph'
+               for column in Graph.columns_for(proj_data.get('column', 'Price'), proj_data['strategy_name'])]
+    return list(dict.fromkeys(columns))
+
 def load_project_state(projections):
     """
     Load a saved project state.
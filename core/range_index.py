@@ -0,0 +1,184 @@
+import numpy as np
+
+
+class BlockRangeIndex:
+    """
+    Per-block summaries of a column, for answering min, max, mean and variance over a row range
+    without scanning every row in it.
+
+    The index can be built in one go or chunk by chunk while a day is still being read. Each full
+    block keeps its minimum, maximum, sum, sum of squares and count of values. On the first query,
+    the block minima and maxima are arranged in a sparse table and the sums in prefix sums, so the
+    whole blocks inside any range are combined in constant time; only the partial blocks at the
+    range edges are scanned, at most two blocks' worth of rows. Missing values are ignored.
+
+    Sums are taken relative to the first value indexed, which keeps the sums of squares small
+    enough for the variance of price-like columns to stay accurate.
+
+    Attributes:
+        block_size (int): Rows per block.
+        rows (int): Number of rows indexed so far.
+
+    Methods:
+        append(values): Add the next chunk of rows.
+        value_range(values, start, stop): Return (min, max) of values[start:stop].
+        value_stats(values, start, stop): Return (min, max, mean, variance) of values[start:stop].
+    """
+
+    def __init__(self, values=None, block_size=1024):
+        """
+        Initialize a BlockRangeIndex.
+
+        Args:
+            values (numpy.ndarray, optional): A whole column to index. Default is None (append chunks later).
+            block_size (int, optional): Rows per block. Default is 1024.
+        """
+        self.block_size = block_size
+        self.rows = 0
+        self._mins = []
+        self._maxs = []
+        self._sums = []
+        self._squares = []
+        self._counts = []
+        self._reference = None  # First value indexed; sums are taken relative to it.
+        self._tail = np.empty(0)  # Rows of the last, incomplete block.
+        self._tables = None  # Sparse tables and prefix sums, built on first query.
+        if values is not None:
+            self.append(values)
+
+    def append(self, values):
+        """
+        Add the next chunk of rows.
+
+        Args:
+            values (numpy.ndarray): The column values of those rows.
+        """
+        self.rows += len(values)
+        values = np.concatenate([self._tail, np.asarray(values, dtype=np.float64)])
+        if self._reference is None:
+            finite = values[np.isfinite(values)]
+            if len(finite):
+                self._reference = finite[0]
+        full = len(values) // self.block_size * self.block_size
+        if full:
+            blocks = values[:full].reshape(-1, self.block_size)
+            # fmin/fmax skip NaN; a block of only NaN stays NaN.
+            self._mins.append(np.fmin.reduce(blocks, axis=1))
+            self._maxs.append(np.fmax.reduce(blocks, axis=1))
+            finite = np.isfinite(blocks)
+            shifted = np.where(finite, blocks - (self._reference or 0.0), 0.0)
+            self._sums.append(shifted.sum(axis=1))
+            self._squares.append((shifted * shifted).sum(axis=1))
+            self._counts.append(finite.sum(axis=1))
+            self._tables = None
+        self._tail = values[full:]
+
+    def _build_tables(self):
+        """
+        Return the sparse tables of the block minima and maxima and the prefix sums of the block
+        sums, building them if blocks were appended since the last query.
+
+        Level k of a sparse table holds the minimum (or maximum) of every run of 2**k blocks.
+
+        Returns:
+            tuple: (min levels, max levels, prefix sums, prefix sums of squares, prefix counts).
+        """
+        if self._tables is None:
+            def joined(parts):
+                return np.concatenate(parts) if parts else np.empty(0)
+
+            def prefix(parts):
+                return np.concatenate([[0.0], np.cumsum(joined(parts))])
+
+            min_levels, max_levels = [joined(self._mins)], [joined(self._maxs)]
+            width = 1
+            while 2 * width <= len(min_levels[0]):
+                min_levels.append(np.fmin(min_levels[-1][:-width], min_levels[-1][width:]))
+                max_levels.append(np.fmax(max_levels[-1][:-width], max_levels[-1][width:]))
+                width *= 2
+            self._tables = (min_levels, max_levels, prefix(self._sums), prefix(self._squares),
+                            prefix(self._counts))
+        return self._tables
+
+    def _split(self, values, start, stop):
+        """
+        Split a row range into the whole blocks inside it and the rows at its edges.
+
+        Args:
+            values (numpy.ndarray): The indexed column.
+            start (int): First row of the range.
+            stop (int): One past the last row of the range.
+
+        Returns:
+            tuple: (first block, one past the last block, list of edge row arrays). The block range
+                   is empty when the rows do not cover a whole block.
+        """
+        blocks = len(self._build_tables()[0][0])
+        first_block = -(-start // self.block_size)
+        last_block = min(stop // self.block_size, blocks)
+        if first_block >= last_block:
+            return 0, 0, [values[start:stop]]
+        return first_block, last_block, [values[start:first_block * self.block_size],
+                                         values[last_block * self.block_size:stop]]
+
+    def value_range(self, values, start, stop):
+        """
+        Return the minimum and maximum of values[start:stop].
+
+        Args:
+            values (numpy.ndarray): The indexed column.
+            start (int): First row of the range.
+            stop (int): One past the last row of the range.
+
+        Returns:
+            tuple: (min, max), both NaN if the range holds no values.
+        """
+        start, stop = int(start), int(stop)  # numpy integers have no bit_length
+        first_block, last_block, edges = self._split(values, start, stop)
+        min_levels, max_levels = self._build_tables()[:2]
+
+        low, high = np.nan, np.nan
+        if first_block < last_block:
+            # Two runs of 2**level blocks cover the blocks exactly, overlapping in the middle.
+            level = (last_block - first_block).bit_length() - 1
+            other = last_block - (1 << level)
+            low = np.fmin(min_levels[level][first_block], min_levels[level][other])
+            high = np.fmax(max_levels[level][first_block], max_levels[level][other])
+        for part in edges:
+            if len(part):
+                low = np.fmin(low, np.fmin.reduce(part))
+                high = np.fmax(high, np.fmax.reduce(part))
+        return float(low), float(high)
+
+    def value_stats(self, values, start, stop):
+        """
+        Return the minimum, maximum, mean and (population) variance of values[start:stop].
+
+        Args:
+            values (numpy.ndarray): The indexed column.
+            start (int): First row of the range.
+            stop (int): One past the last row of the range.
+
+        Returns:
+            tuple: (min, max, mean, variance), all NaN if the range holds no values.
+        """
+        start, stop = int(start), int(stop)
+        low, high = self.value_range(values, start, stop)
+        first_block, last_block, edges = self._split(values, start, stop)
+        sums, squares, counts = self._build_tables()[2:]
+
+        total = sums[last_block] - sums[first_block]
+        total_squares = squares[last_block] - squares[first_block]
+        count = counts[last_block] - counts[first_block]
+        for part in edges:
+            part = np.asarray(part, dtype=np.float64)
+            shifted = part[np.isfinite(part)] - (self._reference or 0.0)
+            total += shifted.sum()
+            total_squares += (shifted * shifted).sum()
+            count += len(shifted)
+
+        if not count:
+            return np.nan, np.nan, np.nan, np.nan
+        shifted_mean = total / count
+        variance = max(total_squares / count - shifted_mean * shifted_mean, 0.0)
+        return low, high, float((self._reference or 0.0) + shifted_mean), float(variance)
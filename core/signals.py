@@ -0,0 +1,73 @@
+import numpy as np
+
+
+class SignalIndex:
+    """
+    The rows of a day that carry a strategy signal, for drawing signal markers without visiting
+    every row.
+
+    Strategy columns are almost entirely 0, so only the rows with a non-zero (and non-missing) value
+    are kept, in order. The rows of a display range are found by binary search, and the colour and
+    label of each signal value are looked up once per distinct value rather than once per row.
+
+    Attributes:
+        rows (numpy.ndarray): The row numbers of the signals, ascending.
+        codes (numpy.ndarray): The signal value of each of those rows.
+
+    Methods:
+        events(start, stop, strategy): Return the displayable signals of a row range.
+    """
+
+    def __init__(self, signals):
+        """
+        Initialize a SignalIndex.
+
+        Args:
+            signals (numpy.ndarray): The strategy column of a day.
+        """
+        signals = np.asarray(signals)
+        if signals.dtype == bool or np.issubdtype(signals.dtype, np.number):
+            signals = signals.astype(np.float64)
+            self.rows = np.flatnonzero((signals != 0) & ~np.isnan(signals))
+        else:
+            self.rows = np.empty(0, dtype=np.int64)  # Text signals match none of the strategy's values.
+            signals = np.empty(0)
+        self.codes = signals[self.rows]
+        self._tables = {}  # id(strategy) -> (strategy, its mapping when resolved, {code: (color, label)})
+
+    def display_table(self, strategy):
+        """
+        Return the color and label of every distinct signal value of the day, as resolved by a strategy.
+
+        Args:
+            strategy (Strategy): Maps signal values to display information.
+
+        Returns:
+            dict: Signal value to (color, label); values the strategy does not know give (None, None).
+        """
+        cached = self._tables.get(id(strategy))
+        if cached is None or cached[0] is not strategy or cached[1] != strategy.mapping:
+            table = {code: strategy.get_signal_display_info(code) for code in np.unique(self.codes).tolist()}
+            cached = self._tables[id(strategy)] = (strategy, dict(strategy.mapping), table)
+        return cached[2]
+
+    def events(self, start, stop, strategy):
+        """
+        Return the signals of rows start..stop that the strategy has a color for.
+
+        Args:
+            start (int): First row of the range.
+            stop (int): One past the last row of the range.
+            strategy (Strategy): Maps signal values to display information.
+
+        Returns:
+            list[tuple]: (row, color, label) of each signal, in row order.
+        """
+        first, last = np.searchsorted(self.rows, [start, stop])
+        table = self.display_table(strategy)
+        events = []
+        for row, code in zip(self.rows[first:last].tolist(), self.codes[first:last].tolist()):
+            color, label = table[code]
+            if color is not None:
+                events.append((row, color, label))
+        return events
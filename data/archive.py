@@ -0,0 +1,240 @@
+import json
+import os
+import re
+import sys
+
+import numpy as np
+
+from data.ingest import load_day
+
+ARCHIVE_NAME = 'archive.bin'
+INDEX_NAME = 'archive.json'
+DAY_FILE_PATTERN = re.compile(r'^Day(\d+)\.csv$')
+ALIGNMENT = 64  # Byte alignment of every column block inside the archive file.
+
+
+def archive_paths(strategy_path):
+    """
+    Return the (data file, index file) paths of a strategy's archive.
+
+    Args:
+        strategy_path (str): The strategy directory, e.g. ./data/strategy_zero.
+
+    Returns:
+        tuple[str, str]: Paths of archive.bin and archive.json inside that directory.
+    """
+    return os.path.join(strategy_path, ARCHIVE_NAME), os.path.join(strategy_path, INDEX_NAME)
+
+
+def build_archive(strategy_path):
+    """
+    Pack every DayN.csv of a strategy into one contiguous, column-major archive file.
+
+    Each column is stored as one block holding all days back to back, and archive.json maps every
+    day number to its row range and records the (mtime_ns, size) stamp of the CSV it was read from,
+    so a CSV edited later is noticed (see DayArchive.is_current). Only columns present in every day
+    are archived. The data file is replaced before the index, and the index records the data
+    file's size, so a reader never pairs a new index with an old data file.
+
+    Args:
+        strategy_path (str): The strategy directory, e.g. ./data/strategy_zero.
+
+    Returns:
+        int: The number of days written.
+    """
+    day_files = sorted((int(match.group(1)), name) for name in os.listdir(strategy_path)
+                       for match in [DAY_FILE_PATTERN.match(name)] if match)
+    if not day_files:
+        print(f"Warning: No day files found in {strategy_path}.")
+        return 0
+
+    # First pass: row ranges, the shared columns and their dtypes.
+    days = []
+    sources = {}
+    column_dtypes = None
+    start = 0
+    for day, name in day_files:
+        stat = os.stat(os.path.join(strategy_path, name))
+        sources[str(day)] = [stat.st_mtime_ns, stat.st_size]
+        timestamps, columns = load_day(os.path.join(strategy_path, name))
+        days.append([day, start, start + len(timestamps)])
+        start += len(timestamps)
+        if column_dtypes is None:
+            column_dtypes = {col: values.dtype for col, values in columns.items()}
+        else:
+            column_dtypes = {col: np.result_type(dtype, columns[col].dtype)
+                             for col, dtype in column_dtypes.items() if col in columns}
+    total_rows = start
+
+    # Second pass: write one block per column, all days back to back.
+    data_path, index_path = archive_paths(strategy_path)
+    blocks = {}
+    offset = 0
+    with open(data_path + '.tmp', 'wb') as f:
+        for col, dtype in [('DateTime', np.dtype(np.int64))] + list(column_dtypes.items()):
+            padding = -offset % ALIGNMENT
+            f.write(b'\0' * padding)
+            offset += padding
+            blocks[col] = {'offset': offset, 'dtype': dtype.str}
+
+            for day, name in day_files:
+                timestamps, columns = load_day(os.path.join(strategy_path, name))
+                values = timestamps if col == 'DateTime' else columns[col]
+                f.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+            offset += total_rows * dtype.itemsize
+
+    # Data first, index last: an old index does not match the new data file's size, so readers
+    # ignore the archive until the new index is in place.
+    os.replace(data_path + '.tmp', data_path)
+    with open(index_path + '.tmp', 'w') as f:
+        json.dump({'rows': total_rows, 'columns': blocks, 'days': days, 'sources': sources,
+                   'data_size': offset}, f)
+    os.replace(index_path + '.tmp', index_path)
+    return len(days)
+
+
+class DayArchive:
+    """
+    A read-only, memory-mapped view over a strategy archive written by build_archive.
+
+    Moving to a day only slices the mapped column blocks, so it costs the same for any day and the
+    resident memory does not grow with the size of the archive.
+
+    Attributes:
+        days (list[int]): The sorted day numbers held by the archive.
+        mtime (float): Modification time of the archive, the later of its data and index files.
+
+    Methods:
+        has_day(day): Return True if the archive holds the given day.
+        is_current(day, csv_path): Return True if the archive holds the day and its CSV is unchanged.
+        day_columns(day): Return zero-copy (timestamps, columns) views for one day.
+    """
+
+    def __init__(self, data_path, index_path):
+        """
+        Map an archive into memory.
+
+        Args:
+            data_path (str): Path of archive.bin.
+            index_path (str): Path of archive.json.
+
+        Raises:
+            ValueError: If the index does not belong to the data file, e.g. while the archive is rebuilt.
+        """
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+        if 'data_size' in index and index['data_size'] != os.path.getsize(data_path):
+            raise ValueError(f"{index_path} does not match {data_path}")
+
+        self.mtime = max(os.path.getmtime(data_path), os.path.getmtime(index_path))
+        self._ranges = {day: (start, stop) for day, start, stop in index['days']}
+        # Archives built before stamps were recorded have none; their days are taken as current.
+        self._sources = {int(day): tuple(stamp) for day, stamp in index.get('sources', {}).items()}
+        self._warned = set()  # Days already reported as stale.
+        self.days = sorted(self._ranges)
+
+        rows = index['rows']
+        self._columns = {}
+        for col, block in index['columns'].items():
+            if not rows:  # Empty archives cannot be memory-mapped.
+                self._columns[col] = np.empty(0, dtype=np.dtype(block['dtype']))
+                continue
+            self._columns[col] = np.memmap(data_path, dtype=np.dtype(block['dtype']), mode='r',
+                                           offset=block['offset'], shape=(rows,))
+
+    def has_day(self, day):
+        """
+        Return True if the archive holds the given day.
+
+        Args:
+            day (int): The day number.
+
+        Returns:
+            bool: Whether the day is in the archive.
+        """
+        return day in self._ranges
+
+    def is_current(self, day, csv_path):
+        """
+        Return True if the archive holds the given day and the day's CSV, if it still exists, was
+        not changed since the archive was built. A stale day is reported once, and should be read
+        from its CSV instead.
+
+        Args:
+            day (int): The day number.
+            csv_path (str): Path of the day's CSV.
+
+        Returns:
+            bool: Whether the archived copy of the day can be used.
+        """
+        if day not in self._ranges:
+            return False
+        recorded = self._sources.get(day)
+        try:
+            stat = os.stat(csv_path)
+        except FileNotFoundError:
+            return True  # Archived days do not need their CSV.
+        if recorded is None or recorded == (stat.st_mtime_ns, stat.st_size):
+            return True
+        if day not in self._warned:
+            self._warned.add(day)
+            print(f"Warning: {csv_path} changed since the archive was built; reading the CSV instead. "
+                  f"Re-run 'python -m data.archive' to update the archive.")
+        return False
+
+    def day_columns(self, day):
+        """
+        Return zero-copy views of one day's rows.
+
+        Args:
+            day (int): The day number.
+
+        Returns:
+            tuple: (timestamps, columns) in the same shape as data.ingest.load_day returns.
+
+        Raises:
+            KeyError: If the day is not in the archive.
+        """
+        start, stop = self._ranges[day]
+        columns = {col: values[start:stop] for col, values in self._columns.items()}
+        return columns.pop('DateTime'), columns
+
+
+_open_archives = {}  # strategy path -> DayArchive
+
+
+def open_archive(strategy_path):
+    """
+    Return the DayArchive of a strategy directory, or None if it has no archive.
+
+    Archives are mapped once and re-mapped only when the archive files change. An archive whose
+    index does not match its data file (one being rebuilt) is treated as absent.
+
+    Args:
+        strategy_path (str): The strategy directory, e.g. ./data/strategy_zero.
+
+    Returns:
+        DayArchive or None: The mapped archive.
+    """
+    strategy_path = os.path.normpath(strategy_path)
+    data_path, index_path = archive_paths(strategy_path)
+    if not (os.path.exists(data_path) and os.path.exists(index_path)):
+        _open_archives.pop(strategy_path, None)
+        return None
+
+    archive = _open_archives.get(strategy_path)
+    if archive is None or archive.mtime != max(os.path.getmtime(data_path), os.path.getmtime(index_path)):
+        try:
+            archive = DayArchive(data_path, index_path)
+        except (OSError, ValueError):
+            _open_archives.pop(strategy_path, None)
+            return None
+        _open_archives[strategy_path] = archive
+    return archive
+
+
+if __name__ == "__main__":
+    # Usage: python -m data.archive strategy_zero
+    for strategy in sys.argv[1:]:
+        count = build_archive(os.path.join('.', 'data', strategy))
+        print(f"Archived {count} days of {strategy}.")
@@ -0,0 +1,403 @@
+import itertools
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Columns holding strategy signals; stored as int8 when every value fits.
+SIGNAL_COLUMNS = ('Strategy',)
+
+CACHE_DIR_NAME = '.cache'
+DATETIME_FORMAT = '%m/%d/%Y %H:%M'
+MANIFEST_NAME = 'manifest.json'
+
+# CSVs at least this large are read in chunks of STREAM_CHUNK_ROWS rows straight into the cache files.
+STREAM_THRESHOLD_BYTES = 32 * 1024 * 1024
+STREAM_CHUNK_ROWS = 250_000
+
+# One lock per cache directory serializes updates of that cache between the UI and prefetch threads,
+# so converting one day never holds up reading another.
+_cache_locks = {}
+_cache_locks_guard = threading.Lock()
+
+
+def cache_dir_for(csv_path):
+    """
+    Return the cache directory of a day CSV, e.g. ./data/strategy_zero/.cache/Day1 for Day1.csv.
+
+    Args:
+        csv_path (str): Path to the day CSV.
+
+    Returns:
+        str: The directory holding the cached columns of that CSV.
+    """
+    directory, filename = os.path.split(os.path.normpath(csv_path))
+    return os.path.join(directory, CACHE_DIR_NAME, os.path.splitext(filename)[0])
+
+
+def _cache_lock(csv_path):
+    """
+    Return the lock guarding updates of a day CSV's cache directory.
+    """
+    cache_dir = cache_dir_for(csv_path)
+    with _cache_locks_guard:
+        return _cache_locks.setdefault(cache_dir, threading.Lock())
+
+
+def _source_stamp(csv_path):
+    """
+    Return the (mtime_ns, size) pair the cache is validated against.
+    """
+    stat = os.stat(csv_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _column_dtype(name, values):
+    """
+    Pick the compact storage dtype for a parsed column.
+
+    Args:
+        name (str): The column name.
+        values (numpy.ndarray): The parsed values.
+
+    Returns:
+        numpy.dtype: int8 for signal columns that fit, float64/int64 for numbers, else the parsed dtype.
+    """
+    if name in SIGNAL_COLUMNS and values.dtype.kind in 'iuf' and len(values):
+        if np.all(np.isfinite(values)) and np.all(values == np.round(values)) \
+                and values.min() >= -128 and values.max() <= 127:
+            return np.dtype(np.int8)
+    if values.dtype.kind == 'f':
+        return np.dtype(np.float64)
+    if values.dtype.kind in 'iu':
+        return np.dtype(np.int64)
+    return values.dtype
+
+
+def read_header(csv_path):
+    """
+    Return the column names of a day CSV without reading its rows.
+
+    Args:
+        csv_path (str): Path to the day CSV.
+
+    Returns:
+        list[str]: The column names, including 'DateTime'.
+    """
+    return pd.read_csv(csv_path, nrows=0).columns.tolist()
+
+
+def parse_csv(csv_path, columns=None):
+    """
+    Parse a day CSV into epoch timestamps and typed column arrays.
+
+    Args:
+        csv_path (str): Path to the day CSV.
+        columns (list[str], optional): Only parse these columns (plus 'DateTime'). Default is all.
+
+    Returns:
+        tuple: (timestamps, columns) where timestamps is an int64 array of epoch nanoseconds and
+               columns maps every other parsed column name to a numpy array.
+    """
+    usecols = None if columns is None else ['DateTime'] + [name for name in columns if name != 'DateTime']
+    raw = pd.read_csv(csv_path, usecols=usecols)
+    timestamps = pd.to_datetime(raw.pop('DateTime'), format=DATETIME_FORMAT).to_numpy().view(np.int64)
+
+    parsed = {}
+    for name in raw.columns:
+        values = raw[name].to_numpy()
+        parsed[name] = values.astype(_column_dtype(name, values), copy=False)
+    return timestamps, parsed
+
+
+def count_rows(csv_path):
+    """
+    Count the data rows of a CSV by counting line breaks, without parsing it.
+
+    Args:
+        csv_path (str): Path to the CSV.
+
+    Returns:
+        int: The number of lines after the header. Blank lines are counted too, so this is an upper bound.
+    """
+    lines = 0
+    last = b'\n'
+    with open(csv_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            lines += block.count(b'\n')
+            last = block[-1:]
+    if last != b'\n':
+        lines += 1  # The last line has no line break.
+    return max(lines - 1, 0)
+
+
+def _stream_columns(csv_path, cache_dir, columns, write_timestamps, on_chunk=None, progress=None,
+                    chunk_rows=STREAM_CHUNK_ROWS):
+    """
+    Read a CSV chunk by chunk into preallocated, memory-mapped .npy files in its cache directory.
+
+    Each chunk is parsed, written into the final files and dropped, so memory use is bounded by
+    one chunk rather than by pandas' copies of the whole file. A column whose later chunks do not
+    fit the dtype picked for the first one is widened in place.
+
+    Args:
+        csv_path (str): Path to the day CSV.
+        cache_dir (str): The cache directory to write into.
+        columns (list[str]): The columns to convert.
+        write_timestamps (bool): Whether to write DateTime.npy as well.
+        on_chunk (callable, optional): Called with (timestamps, columns) of every chunk. Default is None.
+        progress (callable, optional): Called with the fraction of rows read after every chunk. Default is None.
+        chunk_rows (int, optional): Rows per chunk. Default is STREAM_CHUNK_ROWS.
+
+    Returns:
+        tuple: (rows, files, text_columns) where files maps converted column names to their file names.
+    """
+    header = read_header(csv_path)
+    total = count_rows(csv_path)
+    buffers = {}  # file name -> (temporary path, memory-mapped array)
+    allocations = itertools.count()
+
+    def allocate(filename, dtype, done=0):
+        tmp_path = os.path.join(cache_dir, f"{filename}.{os.getpid()}.{next(allocations)}.tmp.npy")
+        buffer = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=dtype, shape=(total,))
+        if filename in buffers:
+            old_path, old_buffer = buffers[filename]
+            buffer[:done] = old_buffer[:done]
+            del old_buffer
+            os.remove(old_path)
+        buffers[filename] = (tmp_path, buffer)
+        return buffer
+
+    if write_timestamps:
+        allocate('DateTime.npy', np.int64)
+    files = {}
+    text_columns = []
+    done = 0
+    for chunk in pd.read_csv(csv_path, usecols=['DateTime'] + list(columns), chunksize=chunk_rows):
+        count = len(chunk)
+        timestamps = pd.to_datetime(chunk.pop('DateTime'), format=DATETIME_FORMAT).to_numpy().view(np.int64)
+        if write_timestamps:
+            buffers['DateTime.npy'][1][done:done + count] = timestamps
+
+        parsed = {}
+        for name in chunk.columns:
+            if name in text_columns:
+                continue
+            values = chunk[name].to_numpy()
+            filename = f"col{header.index(name)}.npy"
+            if values.dtype.kind == 'O':
+                text_columns.append(name)  # Text columns are not cached; graphs only use numbers.
+                if filename in buffers:
+                    path, _ = buffers.pop(filename)
+                    os.remove(path)
+                    del files[name]
+                continue
+
+            dtype = _column_dtype(name, values)
+            if filename not in buffers:
+                buffer = allocate(filename, dtype)
+                files[name] = filename
+            else:
+                buffer = buffers[filename][1]
+                if not np.can_cast(dtype, buffer.dtype):
+                    buffer = allocate(filename, np.promote_types(buffer.dtype, dtype), done)
+            buffer[done:done + count] = values
+            parsed[name] = buffer[done:done + count]
+
+        if on_chunk is not None:
+            on_chunk(timestamps, parsed)
+        done += count
+        if progress is not None:
+            progress(done / total if total else 1.0)
+
+    for filename, (tmp_path, buffer) in buffers.items():
+        if done != total:  # Blank lines were counted; keep only the parsed rows.
+            np.save(tmp_path, np.array(buffer[:done]))
+        else:
+            buffer.flush()
+        del buffer
+        os.replace(tmp_path, os.path.join(cache_dir, filename))
+    return done, files, text_columns
+
+
+def _save_array(path, values):
+    """
+    Write a .npy file through a temporary file, so readers never map a half-written column.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp.npy"  # np.save would append .npy to any other suffix.
+    np.save(tmp_path, values)
+    os.replace(tmp_path, path)
+
+
+def _write_manifest(cache_dir, manifest):
+    """
+    Replace the manifest of a cache directory atomically.
+    """
+    tmp_path = os.path.join(cache_dir, MANIFEST_NAME + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, os.path.join(cache_dir, MANIFEST_NAME))
+
+
+def _missing_columns(manifest, columns):
+    """
+    Return the columns a cache manifest lacks out of the requested ones (None for every column).
+    """
+    header = manifest['header']
+    wanted = [name for name in header if name != 'DateTime'] if columns is None else \
+        [name for name in columns if name in header and name != 'DateTime']
+    return [name for name in wanted if name not in manifest['columns'] and name not in manifest['text_columns']]
+
+
+def update_cache(csv_path, columns=None, on_chunk=None, progress=None):
+    """
+    Make sure the cache of a day CSV holds the timestamps and the given columns, converting only
+    the columns that are not cached yet.
+
+    A cache whose CSV changed (mtime or size) is started over. The manifest is written last, so
+    an interrupted update is simply redone on the next read. Large CSVs are streamed in chunks
+    (see STREAM_THRESHOLD_BYTES). A cache that already holds the columns is returned without
+    taking the cache's lock; only conversions are serialized, per cache directory.
+
+    Args:
+        csv_path (str): Path to the day CSV.
+        columns (list[str], optional): The columns to cache. Default is every column.
+        on_chunk (callable, optional): Called with (timestamps, columns) of the newly converted data, once
+                                       per chunk for streamed CSVs and once otherwise. Default is None.
+        progress (callable, optional): Called with the fraction of rows converted so far. Default is None.
+
+    Returns:
+        dict: The manifest of the updated cache.
+    """
+    manifest = read_manifest(csv_path)
+    if manifest is not None and manifest['rows'] is not None and not _missing_columns(manifest, columns):
+        return manifest
+
+    with _cache_lock(csv_path):
+        manifest = read_manifest(csv_path)  # Another thread may have converted it meanwhile.
+        if manifest is None:
+            stamp = _source_stamp(csv_path)
+            manifest = {
+                'source_mtime_ns': stamp[0],
+                'source_size': stamp[1],
+                'header': read_header(csv_path),
+                'rows': None,
+                'columns': {},
+                'text_columns': [],
+            }
+
+        header = manifest['header']
+        missing = _missing_columns(manifest, columns)
+        if not missing and manifest['rows'] is not None:
+            return manifest
+
+        cache_dir = cache_dir_for(csv_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        if manifest['source_size'] >= STREAM_THRESHOLD_BYTES:
+            rows, files, text_columns = _stream_columns(csv_path, cache_dir, missing, manifest['rows'] is None,
+                                                        on_chunk, progress)
+            manifest['rows'] = rows
+            manifest['columns'].update(files)
+            manifest['text_columns'].extend(text_columns)
+            _write_manifest(cache_dir, manifest)
+            return manifest
+
+        timestamps, parsed = parse_csv(csv_path, missing)
+        if manifest['rows'] is None:
+            _save_array(os.path.join(cache_dir, 'DateTime.npy'), timestamps)
+            manifest['rows'] = len(timestamps)
+        for name, values in parsed.items():
+            if values.dtype.kind == 'O':
+                manifest['text_columns'].append(name)  # Text columns are not cached; graphs only use numbers.
+                continue
+            filename = f"col{header.index(name)}.npy"
+            _save_array(os.path.join(cache_dir, filename), values)
+            manifest['columns'][name] = filename
+
+        _write_manifest(cache_dir, manifest)
+        if on_chunk is not None:
+            on_chunk(timestamps, {name: values for name, values in parsed.items() if values.dtype.kind != 'O'})
+        if progress is not None:
+            progress(1.0)
+        return manifest
+
+
+def read_manifest(csv_path):
+    """
+    Return the cache manifest of a day CSV if the cache is still valid for the file on disk.
+
+    Args:
+        csv_path (str): Path to the day CSV.
+
+    Returns:
+        dict or None: The manifest, or None if there is no cache or the CSV's mtime or size changed.
+    """
+    manifest_path = os.path.join(cache_dir_for(csv_path), MANIFEST_NAME)
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if (manifest.get('source_mtime_ns'), manifest.get('source_size')) != _source_stamp(csv_path):
+        return None
+    return manifest
+
+
+def load_day(csv_path, columns=None, on_chunk=None, progress=None):
+    """
+    Load a day from its columnar cache, converting whatever is missing or stale first.
+
+    Cached columns are memory-mapped read-only, so loading a day costs no parsing at all once
+    its columns have been converted.
+
+    Args:
+        csv_path (str): Path to the day CSV.
+        columns (list[str], optional): Only load these columns; names the file does not have are
+                                       ignored. Default is every column.
+        on_chunk (callable, optional): Passed to update_cache. Default is None.
+        progress (callable, optional): Passed to update_cache. Default is None.
+
+    Returns:
+        tuple: (timestamps, columns) where timestamps is an int64 array of epoch nanoseconds and
+               columns maps column names to numpy arrays.
+
+    Raises:
+        FileNotFoundError: If the CSV does not exist.
+    """
+    try:
+        manifest = update_cache(csv_path, columns, on_chunk, progress)
+    except OSError as e:
+        if not os.path.exists(csv_path):
+            raise
+        print(f"Warning: Could not write the cache for {csv_path} ({e}). Reading the CSV directly.")
+        return parse_csv(csv_path, columns)
+
+    cache_dir = cache_dir_for(csv_path)
+    mmap_mode = 'r' if manifest['rows'] else None  # Empty files cannot be memory-mapped.
+    wanted = manifest['columns'] if columns is None else [name for name in columns if name in manifest['columns']]
+    try:
+        timestamps = np.load(os.path.join(cache_dir, 'DateTime.npy'), mmap_mode=mmap_mode)
+        loaded = {name: np.load(os.path.join(cache_dir, manifest['columns'][name]), mmap_mode=mmap_mode)
+                  for name in wanted}
+    except (OSError, ValueError):
+        # A cache file went missing or is damaged; read the CSV directly this time.
+        return parse_csv(csv_path, columns)
+    return timestamps, loaded
+
+
+def column_names(csv_path):
+    """
+    Return the data column names of a day CSV (everything but 'DateTime'), from the cache if possible.
+
+    Args:
+        csv_path (str): Path to the day CSV.
+
+    Returns:
+        list[str]: The column names.
+    """
+    manifest = read_manifest(csv_path)
+    header = manifest['header'] if manifest is not None else read_header(csv_path)
+    return [name for name in header if name != 'DateTime']
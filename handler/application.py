@@ -4,12 +4,17 @@ from core.graph import Graph
 from menu.switch_button import SwitchButton
 from menu.main_menu import Menu
 from menu.menu_button import MenuButton
-from core.presets import save_preset, load_preset
+from core.presets import save_preset, load_preset, preset_data_files, preset_data_columns
 from analysis.slider import Slider
 from analysis.table import DataTable
 from core.dayswitch import DaySwitch
+from core.loading import day_loader
+from core.day_store import day_store
 from analysis.range_slider import RangeSlider
+from utils.dirty_rects import DirtyRects
+from utils.text_cache import text_cache
 import cProfile
+import time
 from PIL import Image, ImageDraw
 import config
 import sys
@@ -32,10 +37,18 @@ class Application:
         self.initialize_projections(data_name, num_vals_table)
 
         self.background_color = (10, 25, 50)
+        self.overlay_font = pygame.font.SysFont(config.font_name, config.font_size)
 
         self.dragging = False
         self.dragged_object = None
 
+        # Only the parts of the screen whose elements changed are repainted and pushed to the display.
+        self.dirty_rects = DirtyRects()
+        self._overlay_state = None
+
+        # Caps the frame rate; when nothing moves, the loop sleeps on the event queue instead.
+        self.frame_clock = pygame.time.Clock()
+
         self.frames = []  # List to store frames for GIF
         self.mouse_positions = []
 
@@ -46,6 +59,11 @@ class Application:
         # Load the saved state
         loaded_projections = load_preset()
 
+        # A pending day change targets the old graphs, so drop it, then hand their day data back
+        day_loader.cancel('day')
+        for graph in self.graphs:
+            graph.release_data()
+
         # Clear the current projections
         self.projections.clear()
 
@@ -73,10 +91,111 @@ class Application:
         loaded_day_switch = next((proj for proj in self.projections if isinstance(proj, DaySwitch)), None)
         if loaded_day_switch:
             loaded_day_switch.graphs = loaded_graphs
+            self.day_switch.shutdown()
             self.day_switch = loaded_day_switch
 
+        if loaded_data_table:
+            self.data_table = loaded_data_table
+
         self.graphs = loaded_graphs
 
+    def shutdown(self):
+        """Stops the loader and prefetch threads before the application exits."""
+        day_loader.cancel()
+        self.day_switch.shutdown()
+
+    def request_load_saved_state(self):
+        """Reads the preset's day files on the loader thread, then loads the preset once they are cached."""
+        paths = preset_data_files()
+
+        def finish_loading(days):
+            # The graphs acquire their own references from the now warm store.
+            self.load_saved_state()
+            for day in days:
+                day_store.release(day)
+
+        day_loader.submit(paths, finish_loading, preset_data_columns(), slot='preset')
+
+    def poll_loading(self):
+        """Swaps in days that finished loading since the last frame."""
+        if day_loader.poll() and self.data_table in self.projections:
+            self.data_table.set_values(self.data_table.current_index)
+
+    def draw_loading_overlay(self):
+        """Dims the graphs and shows a loading label while a day change is pending."""
+        if not day_loader.is_loading:
+            return
+        for graph in self.graphs:
+            overlay = pygame.Surface((graph.width, graph.height), pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, 96))
+            self.screen.blit(overlay, (graph.x, graph.y))
+            text = text_cache.render(self.overlay_font, f"Loading... {day_loader.progress:.0%}", (255, 255, 255))
+            self.screen.blit(text, (graph.x + (graph.width - text.get_width()) / 2,
+                                    graph.y + (graph.height - text.get_height()) / 2))
+
+    def is_animating(self):
+        """True while the screen changes without input: during a drag or while days are loading."""
+        if self.dragging or day_loader.is_loading:
+            return True
+        return any(getattr(proj, flag, False) for proj in self.projections
+                   for flag in ('dragging', 'dragging_position', 'dragging_start', 'dragging_end'))
+
+    def next_events(self):
+        """
+        Returns the pending events. When nothing is animating, blocks until an event arrives or the
+        clock's next second (at most config.idle_timeout_ms), so an idle window costs no CPU.
+        """
+        if self.is_animating():
+            return pygame.event.get()
+        timeout = min(config.idle_timeout_ms, 1000 - int(time.time() * 1000) % 1000 + 1)
+        event = pygame.event.wait(timeout)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+    def draw_element(self, element):
+        """Draws one UI element, with a graph's toggle buttons."""
+        if isinstance(element, Graph):
+            element.display(self.screen, self.graphs)
+            element.toggle_button_grid.display(self.screen)
+            element.toggle_button_chart.display(self.screen)
+            element.toggle_button_strategy.display(self.screen)
+            element.toggle_button_color.display(self.screen)
+            element.toggle_button_timeframe.display(self.screen)
+        else:
+            element.display(self.screen)
+
+    def draw_frame(self):
+        """Repaints the screen regions whose elements changed since the last frame and updates only those."""
+        widgets = []
+        for proj in self.projections:
+            if isinstance(proj, Graph):
+                widgets += [proj, proj.highlight_marker]
+            elif not isinstance(proj, (Menu, MenuButton)):
+                widgets.append(proj)
+        menus = [self.menu_button, self.menu]
+
+        # The loading overlay covers every graph, so a change to it repaints everything.
+        overlay_state = (day_loader.is_loading, day_loader.progress) if day_loader.is_loading else None
+        if overlay_state != self._overlay_state:
+            self._overlay_state = overlay_state
+            self.dirty_rects.invalidate()
+
+        rects = self.dirty_rects.collect(widgets + menus, self.screen.get_rect())
+        for rect in rects:
+            self.screen.set_clip(rect)
+            self.screen.fill(self.background_color)
+            for element in widgets:
+                if self.dirty_rects.rect_of(element).colliderect(rect):
+                    self.draw_element(element)
+            self.draw_loading_overlay()
+            for element in menus:
+                if self.dirty_rects.rect_of(element).colliderect(rect):
+                    self.draw_element(element)
+        self.screen.set_clip(None)
+        if rects:
+            pygame.display.update(rects)
+
     def initialize_projections(self, strategy_dir, num_vals_table_param=None):
         if num_vals_table_param:
             num_vals_table = num_vals_table_param
@@ -137,8 +256,9 @@ class Application:
         elif self.menu.save_button.rect.collidepoint(event.pos):
             save_preset(self.projections)
         elif self.menu.load_button.rect.collidepoint(event.pos):
-            self.load_saved_state()
+            self.request_load_saved_state()
         elif self.menu.exit_button.rect.collidepoint(event.pos):
+            self.shutdown()
             sys.exit()
         elif not self.GLOBAL_LOCK and not dragged_object:
             dragged_object = next((proj for proj in self.projections if
@@ -170,6 +290,7 @@ class Application:
     def handle_video_resize(self, event):
         """Handles the window resizing."""
         self.screen = pygame.display.set_mode((event.w, event.h), pygame.RESIZABLE)
+        self.dirty_rects.invalidate()
 
     def handle_mouse_up(self):
         """Handles mouse button release."""
@@ -205,6 +326,7 @@ class Application:
         end_time = pygame.time.get_ticks() + duration * 1000  # Convert to milliseconds
         while pygame.time.get_ticks() < end_time:
             self._main_loop_iteration()
+        self.shutdown()
 
     def capture_frame(self):
         """Capture the current Pygame screen frame."""
@@ -258,6 +380,7 @@ class Application:
                 graph.toggle_button_chart.handle_event(event)
                 graph.toggle_button_strategy.handle_event(event)
                 graph.toggle_button_color.handle_event(event)
+                graph.toggle_button_timeframe.handle_event(event)
 
             if event.type == pygame.QUIT:
                 running = False
@@ -284,19 +407,9 @@ class Application:
 
             pygame.display.flip()
 
-        self.screen.fill(self.background_color)
-        for proj in self.projections:
-            if isinstance(proj, Graph):
-                proj.display(self.screen, self.graphs)
-                proj.toggle_button_grid.display(self.screen)
-                proj.toggle_button_chart.display(self.screen)
-                proj.toggle_button_strategy.display(self.screen)
-                proj.toggle_button_color.display(self.screen)
-            elif not isinstance(proj, (Menu, MenuButton)):
-                proj.display(self.screen)
-        self.menu_button.display(self.screen)
-        self.menu.display(self.screen)
-        pygame.display.flip()
+        self.poll_loading()
+        self.draw_frame()
+        self.frame_clock.tick(config.target_fps)
 
     # ... [End of your Application class] ...
 
@@ -305,12 +418,13 @@ class Application:
         self.dragging = False
         self.dragged_object = None
         while running:
-            for event in pygame.event.get():
+            for event in self.next_events():
                 for graph in self.graphs:
                     graph.toggle_button_grid.handle_event(event)
                     graph.toggle_button_chart.handle_event(event)
                     graph.toggle_button_strategy.handle_event(event)
                     graph.toggle_button_color.handle_event(event)
+                    graph.toggle_button_timeframe.handle_event(event)
 
                 if event.type == pygame.QUIT:
                     running = False
@@ -333,24 +447,12 @@ class Application:
                         proj.handle_events(event, self.GLOBAL_LOCK)
 
             self.menu_button.hover()
+            self.poll_loading()
             # Display logic
-            self.screen.fill(self.background_color)
-            for proj in self.projections:
-
-                if isinstance(proj, Graph):
-                    proj.display(self.screen, self.graphs)
-                    proj.toggle_button_grid.display(self.screen)  # Display the button
-                    proj.toggle_button_chart.display(self.screen)
-                    proj.toggle_button_strategy.display(self.screen)
-                    proj.toggle_button_color.display(self.screen)
-
-                elif not isinstance(proj, (Menu, MenuButton)):
-                    proj.display(self.screen)
-
-            self.menu_button.display(self.screen)
-            self.menu.display(self.screen)
-            pygame.display.flip()
+            self.draw_frame()
+            self.frame_clock.tick(config.target_fps)
 
+        self.shutdown()
         pygame.quit()
 
 
@@ -17,6 +17,8 @@ class Menu(UIElement):
     Methods:
         toggle(): Toggles the visibility of the menu.
         display(screen): Display the menu on the Pygame screen.
+        render_state(): Return what a frame of the menu shows.
+        dirty_rect(): Return the screen area the menu draws on.
         update_position(x, y): Update the menu's position.
         serialize(): Convert the menu object into a serializable dictionary.
         update_position_from_button(menu_button_x, menu_button_y, menu_button_height): Update the menu's position based on a MenuButton's position.
@@ -69,6 +71,26 @@ class Menu(UIElement):
         self.load_button.display(screen)
         self.exit_button.display(screen)
 
+    def render_state(self):
+        """
+        Return what a frame of the menu shows, so unchanged frames need not be repainted.
+
+        Returns:
+            tuple: Whether the menu is shown, its rectangle and the state of its buttons.
+        """
+        return (self.is_active, tuple(self.rect), self.lock_button.is_on,
+                self.save_button.render_state(), self.load_button.render_state(), self.exit_button.render_state())
+
+    def dirty_rect(self):
+        """
+        Return the screen area the menu draws on when it is shown.
+
+        Returns:
+            pygame.Rect: The menu's rectangle, including its buttons.
+        """
+        return self.rect.unionall([self.lock_button.rect, self.save_button.rect, self.load_button.rect,
+                                   self.exit_button.rect])
+
     def toggle(self):
         """
         Toggle the visibility of the menu.
@@ -1,5 +1,6 @@
 import pygame
 from utils.uiux import UIElement
+from utils.text_cache import text_cache
 
 class MenuButton(UIElement):
     """
@@ -17,6 +18,8 @@ class MenuButton(UIElement):
 
     Methods:
         display(screen): Display the button on the Pygame screen.
+        render_state(): Return what a frame of the button shows.
+        dirty_rect(): Return the screen area the button draws on.
         handle_events(event): Handle Pygame events for the button.
         hover(): Change the button color when hovered.
         update_position(dx, dy): Update the button's position by given deltas.
@@ -66,7 +69,7 @@ class MenuButton(UIElement):
         pygame.draw.circle(button_surface, self.color + (128,), (self.rect.width - 5, self.rect.height - 5), 5)
 
         # Render the text with white color
-        text_surf = self.font.render(self.text, True, (255, 255, 255))
+        text_surf = text_cache.render(self.font, self.text, (255, 255, 255))
         text_x = (self.rect.width - text_surf.get_width()) // 2
         text_y = (self.rect.height - text_surf.get_height()) // 2
         button_surface.blit(text_surf, (text_x, text_y))
@@ -74,6 +77,24 @@ class MenuButton(UIElement):
         # Blit the transparent button surface onto the main screen
         screen.blit(button_surface, (self.rect.x, self.rect.y))
 
+    def render_state(self):
+        """
+        Return what a frame of the button shows, so unchanged frames need not be repainted.
+
+        Returns:
+            tuple: The button's rectangle, color and text.
+        """
+        return tuple(self.rect), self.color, self.text
+
+    def dirty_rect(self):
+        """
+        Return the screen area the button draws on.
+
+        Returns:
+            pygame.Rect: The button's rectangle.
+        """
+        return self.rect.copy()
+
     def handle_events(self, event):
         """
         Handle Pygame events for the button.
@@ -1,4 +1,5 @@
 import pygame
+from utils.text_cache import text_cache
 from utils.uiux import UIElement
 
 class SwitchButton(UIElement):
@@ -72,7 +73,7 @@ class SwitchButton(UIElement):
         pygame.draw.circle(button_surface, color + (128,), (self.rect.width - 5, self.rect.height - 5), 5)
 
         # Render the text with black color
-        text_surface = self.font.render(self.text_on if self.is_on else self.text_off, True, (0, 0, 0))
+        text_surface = text_cache.render(self.font, self.text_on if self.is_on else self.text_off, (0, 0, 0))
         text_x = (self.rect.width - text_surface.get_width()) // 2
         text_y = (self.rect.height - text_surface.get_height()) // 2
         button_surface.blit(text_surface, (text_x, text_y))
@@ -0,0 +1,104 @@
+import pygame
+
+
+class DirtyRects:
+    """
+    Works out which parts of the screen must be repainted, by comparing what every UI element shows
+    with what it showed in the previous frame.
+
+    Elements take part through two methods: render_state(), returning a comparable value that changes
+    whenever the element would draw something different, and dirty_rect(), returning the screen area it
+    draws on. An element is dirty when either changed; both its old and new areas are then repainted.
+    Elements that disappear leave their old area dirty.
+
+    Methods:
+        collect(elements, screen_rect): Return the rectangles to repaint this frame.
+        rect_of(element): Return the area an element was found to draw on by the last collect.
+        invalidate(): Repaint the whole screen on the next collect.
+    """
+
+    def __init__(self):
+        """
+        Initialize a DirtyRects tracker. The first collect repaints the whole screen.
+        """
+        self._shown = {}  # element -> (rect, state) of the last frame
+        self._full = True
+
+    def invalidate(self):
+        """
+        Repaint the whole screen on the next collect, e.g. after the display was resized.
+        """
+        self._full = True
+
+    def collect(self, elements, screen_rect):
+        """
+        Return the screen rectangles that changed since the last call.
+
+        Args:
+            elements (list): The UI elements of this frame.
+            screen_rect (pygame.Rect): The rectangle of the whole screen.
+
+        Returns:
+            list[pygame.Rect]: Rectangles to repaint, clipped to the screen; empty if nothing changed.
+        """
+        shown = {}
+        dirty = []
+        for element in elements:
+            rect, state = element.dirty_rect(), element.render_state()
+            shown[element] = (rect, state)
+            previous = self._shown.pop(element, None)
+            if previous is None or previous[0] != rect or previous[1] != state:
+                dirty.append(rect)
+                if previous is not None:
+                    dirty.append(previous[0])
+        dirty.extend(rect for rect, _ in self._shown.values())  # Elements that are gone.
+        self._shown = shown
+
+        if self._full:
+            self._full = False
+            return [screen_rect.copy()]
+        return merge_rects([rect.clip(screen_rect) for rect in dirty if rect.colliderect(screen_rect)])
+
+    def rect_of(self, element):
+        """
+        Return the area an element was found to draw on by the last collect.
+
+        Args:
+            element: An element passed to the last collect.
+
+        Returns:
+            pygame.Rect: Its dirty_rect() at that time.
+        """
+        return self._shown[element][0]
+
+
+def merge_rects(rects):
+    """
+    Merge overlapping rectangles into their bounding rectangle wherever that is no larger than the
+    two rectangles together, so fewer regions are repainted without repainting more pixels.
+    Empty rectangles are dropped.
+
+    Args:
+        rects (list[pygame.Rect]): The rectangles.
+
+    Returns:
+        list[pygame.Rect]: Rectangles covering all of them.
+    """
+    merged = []
+    for rect in rects:
+        if not rect.width or not rect.height:
+            continue
+        rect = pygame.Rect(rect)
+        changed = True
+        while changed:
+            changed = False
+            for i, other in enumerate(merged):
+                union = rect.union(other)
+                if rect.colliderect(other) and union.width * union.height <= (rect.width * rect.height
+                                                                            + other.width * other.height):
+                    rect = union
+                    del merged[i]
+                    changed = True
+                    break
+        merged.append(rect)
+    return merged
@@ -1,4 +1,5 @@
 import pygame
+from utils.text_cache import text_cache
 
 class TextButton:
     """
@@ -56,8 +57,7 @@ class TextButton:
         Args:
             screen (pygame.Surface): The Pygame surface where the button will be displayed.
         """
-        text_surf = self.font.render(self.text, True, self.color)
-        text_surf.set_alpha(self.alpha)
+        text_surf = text_cache.render(self.font, self.text, self.color, alpha=self.alpha)
         screen.blit(text_surf, (self.rect.x, self.rect.y))
 
     def handle_event(self, event):
@@ -0,0 +1,89 @@
+from collections import OrderedDict
+
+
+class TextCache:
+    """
+    A least-recently-used cache of rendered text surfaces, shared by every widget.
+
+    Most text on screen (labels, captions, dates, table cells) is the same from one frame to the
+    next, so rendering it once and blitting the cached surface saves a font.render per text per
+    frame. Surfaces are keyed by (font, text, color, alpha, antialias) and must be treated as
+    read-only by callers, since the same surface is handed out again.
+
+    Attributes:
+        max_entries (int): The most surfaces kept; the least recently used is dropped beyond that.
+        hits (int): Renders answered from the cache.
+        misses (int): Renders that had to call font.render.
+        evictions (int): Surfaces dropped to stay within max_entries.
+
+    Methods:
+        render(font, text, color, alpha=None, antialias=True): Return the rendered text.
+        stats(): Return the hit-rate statistics.
+        clear(): Drop every surface and reset the statistics.
+    """
+
+    def __init__(self, max_entries=4096):
+        """
+        Initialize a TextCache.
+
+        Args:
+            max_entries (int, optional): The most surfaces kept. Default is 4096.
+        """
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font, text, color, alpha=None, antialias=True):
+        """
+        Return text rendered with a font, from the cache when it was rendered before.
+
+        Args:
+            font (pygame.font.Font): The font to render with.
+            text (str): The text.
+            color (tuple or pygame.Color): The text color.
+            alpha (int, optional): Surface transparency (0 to 255) applied to the text. Default is None (opaque).
+            antialias (bool, optional): Whether to antialias the text. Default is True.
+
+        Returns:
+            pygame.Surface: The rendered text. Do not draw on it or change its alpha.
+        """
+        key = (font, text, tuple(color), alpha, antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        if alpha is not None:
+            surface.set_alpha(alpha)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def stats(self):
+        """
+        Return the cache statistics.
+
+        Returns:
+            dict: 'hits', 'misses', 'evictions', 'entries' and 'hit_rate' (0 to 1).
+        """
+        requests = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'entries': len(self._surfaces), 'hit_rate': self.hits / requests if requests else 0.0}
+
+    def clear(self):
+        """
+        Drop every cached surface and reset the statistics.
+        """
+        self._surfaces.clear()
+        self.hits = self.misses = self.evictions = 0
+
+
+# The cache shared by all widgets.
+text_cache = TextCache()